@@ -37,118 +37,132 @@ def show_help():
     print("  sudo SHOONYA_PRODUCTION_MODE=1 python main.py production  # Production mode")
     print("  python main.py portable               # Create portable package")
 
+def _run_cli():
+    # Call the core CLI directly
+    from core.safe.safeerase import main as cli_main
+    return cli_main()
+
+def _run_web():
+    from web.web_gui import app
+    print("🌐 Starting Shoonya Wipe Web GUI...")
+    port = int(os.environ.get("PORT", "5000"))
+    print(f"📱 Open your browser to: http://localhost:{port}")
+    app.run(host='0.0.0.0', port=port, debug=False)
+    return 0
+
+def _run_verify():
+    from core.safe.verify import main as verify_main
+    return verify_main()
+
+def _run_portable():
+    from scripts.offline_mode import main as portable_main
+    return portable_main()
+
+def _run_production():
+    from core.production.production_mode import production_manager
+
+    # Check if production mode is enabled before paying for the heavier
+    # detector/dispatcher imports (common failure path is non-root)
+    if not production_manager.enable_production_mode():
+        print("❌ Production mode not enabled or not running as root")
+        print("   Set SHOONYA_PRODUCTION_MODE=1 and run as root")
+        return 1
+
+    from core.shared.device_detection import DeviceDetector
+    from engine.production.real_dispatcher import RealDispatcher
+
+    print("🔒 Shoonya Wipe - Production Mode")
+    print("⚠️  WARNING: This mode will erase REAL devices!")
+    print("=" * 50)
+
+    # Detect devices
+    detector = DeviceDetector()
+    devices = detector.detect_devices()
+
+    if not devices:
+        print("❌ No devices found")
+        return 1
+
+    # Show available devices
+    print("\nAvailable devices:")
+    for i, device in enumerate(devices):
+        print(f"  {i+1}. {device.name} - {device.path} ({device.size})")
+
+    # Get device selection
+    try:
+        choice = int(input("\nSelect device (number): ")) - 1
+        if choice < 0 or choice >= len(devices):
+            print("❌ Invalid device selection")
+            return 1
+
+        selected_device = devices[choice]
+        print(f"\nSelected: {selected_device.name} - {selected_device.path}")
+
+        # Execute wipe
+        dispatcher = RealDispatcher()
+        success = dispatcher.run_one_click_wipe(selected_device)
+
+        if success:
+            print("✅ Wipe completed successfully")
+            return 0
+        else:
+            print("❌ Wipe failed")
+            return 1
+
+    except (ValueError, KeyboardInterrupt):
+        print("\n❌ Operation cancelled")
+        return 1
+
+def _run_engine():
+    # Safe mode one-click engine
+    from engine.safe.dispatcher import execute
+    from engine.safe.utils import Device
+
+    # Create a test device
+    device = Device(
+        name="VDISK0",
+        path=os.environ.get("SANDBOX_DEVICE", "/app/virtual_media/vdisk0.img"),
+        model="Sandbox VDisk",
+        transport="file",
+        media_type="Flash Memory",
+        size="2G"
+    )
+
+    # Execute wipe
+    result = execute(device, "Test Operator", "Tester", False)
+    print("✅ Engine test completed successfully")
+    print(f"Method: {result['choice']['method']}")
+    print(f"Technique: {result['choice']['technique']}")
+    return 0
+
+def _run_help():
+    show_help()
+    return 0
+
+# O(1) command dispatch; each handler lazy-imports what it needs
+_CMDS = {
+    "cli": _run_cli,
+    "web": _run_web,
+    "verify": _run_verify,
+    "portable": _run_portable,
+    "production": _run_production,
+    "engine": _run_engine,
+    "help": _run_help,
+}
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
         show_help()
         return 1
-    
+
     command = sys.argv[1].lower()
-    
-    if command == "cli":
-        # Call the core CLI directly
-        from core.safe.safeerase import main as cli_main
-        return cli_main()
-    
-    elif command == "web":
-        from web.web_gui import app
-        print("🌐 Starting Shoonya Wipe Web GUI...")
-        port = int(os.environ.get("PORT", "5000"))
-        print(f"📱 Open your browser to: http://localhost:{port}")
-        app.run(host='0.0.0.0', port=port, debug=False)
-        return 0
-    
-    elif command == "verify":
-        from core.safe.verify import main as verify_main
-        return verify_main()
-    
-    elif command == "portable":
-        from scripts.offline_mode import main as portable_main
-        return portable_main()
-    
-    elif command == "production":
-        from core.production.production_mode import production_manager
-        from core.shared.device_detection import DeviceDetector
-        from engine.production.real_dispatcher import RealDispatcher
-        
-        # Check if production mode is enabled
-        if not production_manager.enable_production_mode():
-            print("❌ Production mode not enabled or not running as root")
-            print("   Set SHOONYA_PRODUCTION_MODE=1 and run as root")
-            return 1
-        
-        print("🔒 Shoonya Wipe - Production Mode")
-        print("⚠️  WARNING: This mode will erase REAL devices!")
-        print("=" * 50)
-        
-        # Detect devices
-        detector = DeviceDetector()
-        devices = detector.detect_devices()
-        
-        if not devices:
-            print("❌ No devices found")
-            return 1
-        
-        # Show available devices
-        print("\nAvailable devices:")
-        for i, device in enumerate(devices):
-            print(f"  {i+1}. {device.name} - {device.path} ({device.size})")
-        
-        # Get device selection
-        try:
-            choice = int(input("\nSelect device (number): ")) - 1
-            if choice < 0 or choice >= len(devices):
-                print("❌ Invalid device selection")
-                return 1
-            
-            selected_device = devices[choice]
-            print(f"\nSelected: {selected_device.name} - {selected_device.path}")
-            
-            # Execute wipe
-            dispatcher = RealDispatcher()
-            success = dispatcher.run_one_click_wipe(selected_device)
-            
-            if success:
-                print("✅ Wipe completed successfully")
-                return 0
-            else:
-                print("❌ Wipe failed")
-                return 1
-                
-        except (ValueError, KeyboardInterrupt):
-            print("\n❌ Operation cancelled")
-            return 1
-    
-    elif command == "help":
-        show_help()
-        return 0
-    
-    elif command == "engine":
-        # Safe mode one-click engine
-        from engine.safe.dispatcher import execute
-        from engine.safe.utils import Device
-        
-        # Create a test device
-        device = Device(
-            name="VDISK0", 
-            path=os.environ.get("SANDBOX_DEVICE", "/app/virtual_media/vdisk0.img"), 
-            model="Sandbox VDisk", 
-            transport="file", 
-            media_type="Flash Memory", 
-            size="2G"
-        )
-        
-        # Execute wipe
-        result = execute(device, "Test Operator", "Tester", False)
-        print("✅ Engine test completed successfully")
-        print(f"Method: {result['choice']['method']}")
-        print(f"Technique: {result['choice']['technique']}")
-        return 0
-    
-    else:
+    cmd = _CMDS.get(command)
+    if cmd is None:
         print(f"❌ Unknown command: {command}")
         show_help()
         return 1
+    return cmd()
 
 if __name__ == "__main__":
     sys.exit(main())
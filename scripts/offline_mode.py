@@ -14,39 +14,13 @@ import sys
 import json
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any
 
-def create_portable_package() -> str:
-    """Create a portable package that works without installation."""
-    print("🔧 Creating portable Shoonya Wipe package...")
-    
-    # Create portable directory
-    portable_dir = Path("Shoonya Wipe-Portable")
-    portable_dir.mkdir(exist_ok=True)
-    
-    # Copy essential files
-    essential_files = [
-        "safeerase.py",
-        "verify.py", 
-        "web_gui.py",
-        "requirements.txt",
-        "templates/",
-        "keys/",
-        "README.md"
-    ]
-    
-    for file_path in essential_files:
-        src = Path(file_path)
-        dst = portable_dir / file_path
-        
-        if src.is_file():
-            shutil.copy2(src, dst)
-        elif src.is_dir():
-            shutil.copytree(src, dst, dirs_exist_ok=True)
-    
-    # Create portable launcher
-    launcher_content = '''#!/bin/bash
+# Portable-package file payloads, encoded once at import so packaging is a
+# single write_bytes() per file (no per-call codec/buffer setup)
+_LAUNCHER_SH = '''#!/bin/bash
 # Shoonya Wipe Portable Launcher
 
 echo "🚀 Shoonya Wipe Portable Mode"
@@ -72,15 +46,9 @@ fi
 echo "🌐 Starting Shoonya Wipe Web GUI..."
 echo "📱 Open your browser to: http://localhost:5000"
 python3 web_gui.py
-'''
-    
-    launcher_path = portable_dir / "launch.sh"
-    with open(launcher_path, 'w') as f:
-        f.write(launcher_content)
-    launcher_path.chmod(0o755)
-    
-    # Create Windows launcher
-    windows_launcher = '''@echo off
+'''.encode()
+
+_LAUNCHER_BAT = '''@echo off
 echo 🚀 Shoonya Wipe Portable Mode
 echo ==============================
 
@@ -107,14 +75,9 @@ echo 🌐 Starting Shoonya Wipe Web GUI...
 echo 📱 Open your browser to: http://localhost:5000
 python web_gui.py
 pause
-'''
-    
-    windows_launcher_path = portable_dir / "launch.bat"
-    with open(windows_launcher_path, 'w') as f:
-        f.write(windows_launcher)
-    
-    # Create offline verification tool
-    offline_verifier = '''#!/usr/bin/env python3
+'''.encode()
+
+_OFFLINE_VERIFIER_PY = '''#!/usr/bin/env python3
 """
 Shoonya Wipe - Offline Certificate Verifier
 
@@ -127,37 +90,91 @@ import json
 import base64
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _canonical_dumps(obj) -> bytes:
+    """Canonical (compact, sorted-key) JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    # ensure_ascii=False keeps the fallback byte-identical to orjson
+    return json.dumps(obj, separators=(',', ':'), sort_keys=True, ensure_ascii=False).encode()
+
+
+def _canonical_digest(f):
+    """Hash cert['data'] canonically (compact, sorted keys), streaming.
+
+    With ijson available, each top-level value of `data` is serialized and
+    fed to SHA256 individually, so the full canonical document is never
+    materialized as one string. Falls back to buffered hashing otherwise.
+    """
+    from Crypto.Hash import SHA256
+
+    h = SHA256.new()
+    try:
+        import ijson
+    except ImportError:
+        cert = json.load(f)
+        h.update(_canonical_dumps(cert['data']))
+        return h
+
+    pairs = []
+    for key, value in ijson.kvitems(f, 'data'):
+        pairs.append((key, _canonical_dumps(value)))
+    pairs.sort()
+    h.update(b'{')
+    for i, (key, value_bytes) in enumerate(pairs):
+        if i:
+            h.update(b',')
+        h.update(_canonical_dumps(key))
+        h.update(b':')
+        h.update(value_bytes)
+    h.update(b'}')
+    return h
+
+
+def _read_sig_b64(cert_path):
+    """Pull only signature.sig_b64 out of the certificate file."""
+    try:
+        import ijson
+    except ImportError:
+        with open(cert_path, 'r') as f:
+            return json.load(f)['signature']['sig_b64']
+    with open(cert_path, 'rb') as f:
+        for sig in ijson.items(f, 'signature.sig_b64'):
+            return sig
+    return ''
+
+
 def verify_certificate_offline(cert_path: str, pub_key_path: str) -> bool:
     """Verify a wipe certificate offline."""
     try:
-        # Load certificate
-        with open(cert_path, 'r') as f:
-            cert = json.load(f)
-        
         # Load public key
         with open(pub_key_path, 'r') as f:
             pub_key = f.read()
-        
+
         # Verify signature
         from Crypto.PublicKey import RSA
         from Crypto.Signature import pss
-        from Crypto.Hash import SHA256
-        
-        # Extract signature and data
-        signature = base64.b64decode(cert['signature']['sig_b64'])
-        data = json.dumps(cert['data'], sort_keys=True).encode()
-        
+
+        # Extract signature (small field) and stream-hash the data section
+        with open(cert_path, 'rb') as f:
+            h = _canonical_digest(f)
+        signature = base64.b64decode(_read_sig_b64(cert_path))
+
         # Verify
         key = RSA.import_key(pub_key)
-        h = SHA256.new(data)
         verifier = pss.new(key)
-        
+
         try:
             verifier.verify(h, signature)
             return True
         except:
             return False
-            
+
     except Exception as e:
         print(f"Verification error: {e}")
         return False
@@ -189,15 +206,9 @@ def main():
 
 if __name__ == "__main__":
     main()
-'''
-    
-    verifier_path = portable_dir / "offline_verifier.py"
-    with open(verifier_path, 'w') as f:
-        f.write(offline_verifier)
-    verifier_path.chmod(0o755)
-    
-    # Create README for portable mode
-    readme_content = '''# Shoonya Wipe - Portable Mode
+'''.encode()
+
+_README_PORTABLE_MD = '''# Shoonya Wipe - Portable Mode
 
 ## 🚀 Quick Start
 
@@ -252,11 +263,106 @@ python3 offline_verifier.py out/wipelog_signed.json keys/public.pem
 ## 📞 Support
 
 For issues or questions, check the main README.md
-'''
+'''.encode()
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy file content via in-kernel os.sendfile; plain copyfile elsewhere."""
+    if not hasattr(os, "sendfile"):  # e.g. Windows
+        shutil.copyfile(src, dst)
+        return
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            size = os.fstat(src_fd).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, 1024 * 1024)
+                if sent == 0:
+                    break
+                offset += sent
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _copy_if_changed(src: Path, dst: Path) -> bool:
+    """Copy src to dst only when size or mtime differ. Returns True if copied."""
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+        if (
+            src_stat.st_size == dst_stat.st_size
+            and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+        ):
+            return False
+    except FileNotFoundError:
+        pass
+    _fast_copy(src, dst)
+    # Preserve mtime so the next packaging run can skip unchanged files
+    src_stat = os.stat(src)
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    return True
+
+
+def _sync_tree(src_dir: Path, dst_dir: Path) -> int:
+    """Mirror src_dir into dst_dir, copying only changed files."""
+    copied = 0
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    with os.scandir(src_dir) as entries:
+        for entry in entries:
+            dst = dst_dir / entry.name
+            if entry.is_dir():
+                copied += _sync_tree(Path(entry.path), dst)
+            else:
+                copied += _copy_if_changed(Path(entry.path), dst)
+    return copied
+
+
+def create_portable_package() -> str:
+    """Create a portable package that works without installation."""
+    print("🔧 Creating portable Shoonya Wipe package...")
     
-    readme_path = portable_dir / "README-PORTABLE.md"
-    with open(readme_path, 'w') as f:
-        f.write(readme_content)
+    # Create portable directory
+    portable_dir = Path("Shoonya Wipe-Portable")
+    portable_dir.mkdir(exist_ok=True)
+    
+    # Copy essential files
+    essential_files = [
+        "safeerase.py",
+        "verify.py", 
+        "web_gui.py",
+        "requirements.txt",
+        "templates/",
+        "keys/",
+        "README.md"
+    ]
+    
+    def _copy_entry(file_path: str) -> None:
+        src = Path(file_path)
+        dst = portable_dir / file_path
+
+        if src.is_file():
+            _copy_if_changed(src, dst)
+        elif src.is_dir():
+            # Incremental mirror: unchanged files (same size+mtime) are skipped,
+            # so repeat packaging runs cost near-zero IO
+            _sync_tree(src, dst)
+
+    # Each entry is independent, so copy them concurrently (I/O-bound)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in as_completed(executor.submit(_copy_entry, fp) for fp in essential_files):
+            future.result()
+    
+    # Emit the generated files from the pre-encoded payloads
+    (portable_dir / "launch.sh").write_bytes(_LAUNCHER_SH)
+    (portable_dir / "launch.bat").write_bytes(_LAUNCHER_BAT)
+    (portable_dir / "offline_verifier.py").write_bytes(_OFFLINE_VERIFIER_PY)
+    (portable_dir / "README-PORTABLE.md").write_bytes(_README_PORTABLE_MD)
+    for name in ("launch.sh", "offline_verifier.py"):
+        os.chmod(portable_dir / name, 0o755)
     
     print(f"✅ Portable package created: {portable_dir}")
     return str(portable_dir)
@@ -388,15 +494,17 @@ def main():
     """Main offline mode setup."""
     print("🔒 Shoonya Wipe - Offline Mode Setup")
     print("====================================")
-    
-    # Create portable package
-    portable_dir = create_portable_package()
-    
-    # Create offline verifier
-    verifier_dir = create_offline_verification_tool()
-    
-    # Create bootable ISO (placeholder)
-    iso_dir = create_bootable_iso()
+
+    # The three artifacts are independent and I/O-bound, so build them
+    # concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        portable_future = executor.submit(create_portable_package)
+        verifier_future = executor.submit(create_offline_verification_tool)
+        iso_future = executor.submit(create_bootable_iso)
+
+        portable_dir = portable_future.result()
+        verifier_dir = verifier_future.result()
+        iso_dir = iso_future.result()
     
     print("\n✅ Offline Mode Setup Complete!")
     print(f"📦 Portable package: {portable_dir}")
@@ -4,18 +4,64 @@ Shoonya Wipe - Production Safety Controls
 Safety controls and validations for production mode operations.
 """
 
+import hashlib
 import os
+import re
 import subprocess
 import logging
+import threading
 from typing import List, Tuple
 from pathlib import Path
 
+# System drives and their partitions in one anchored scan instead of a
+# startswith chain over a list
+_SYS_DRIVE_RE = re.compile(r"^/dev/(sda|nvme0n1|mmcblk0)(p?\d+)?$")
+
+# What a partition appends to its disk's path: plain digits (/dev/sdb1),
+# or p+digits when the disk name itself ends in a digit (/dev/nvme0n1p1);
+# requiring the separator keeps /dev/sda10 from counting as a partition
+# of /dev/sda1
+_PARTITION_SUFFIX_NUM_RE = re.compile(r"\d+$")
+_PARTITION_SUFFIX_P_RE = re.compile(r"p\d+$")
+
+
+def _mounts_include_device(sources: set, device_path: str) -> bool:
+    """True when the device or any of its partitions is a mount source.
+
+    Exact membership kills the /dev/sda-vs-/dev/sda1 substring false
+    positive, but a whole disk must still count as mounted when one of
+    its partitions is — wiping /dev/sdb with /dev/sdb1 mounted destroys
+    a live filesystem.
+    """
+    if device_path in sources:
+        return True
+    suffix_re = (
+        _PARTITION_SUFFIX_P_RE
+        if device_path[-1:].isdigit()
+        else _PARTITION_SUFFIX_NUM_RE
+    )
+    return any(
+        src.startswith(device_path) and suffix_re.fullmatch(src[len(device_path):])
+        for src in sources
+    )
+
+# Devices critical for system operation; membership is O(1)
+_CRITICAL_DEVICES = frozenset([
+    '/dev/sda1', '/dev/sda2',  # Common boot partitions
+    '/dev/nvme0n1p1', '/dev/nvme0n1p2',  # NVMe boot partitions
+    '/dev/mmcblk0p1', '/dev/mmcblk0p2',  # eMMC boot partitions
+])
+
 class SafetyController:
     """Controls safety measures for production operations."""
-    
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.safety_checks_enabled = True
+        self._critical = _CRITICAL_DEVICES
+        # Concurrent device wipes report through one controller; keep
+        # the safety trail serialized
+        self._log_lock = threading.Lock()
     
     def validate_production_environment(self) -> Tuple[bool, List[str]]:
         """Validate that the environment is safe for production operations."""
@@ -68,50 +114,63 @@ class SafetyController:
         return len(errors) == 0, errors
     
     def _is_device_mounted(self, device_path: str) -> bool:
-        """Check if device is currently mounted."""
+        """Check if device or one of its partitions is currently mounted."""
+        # /proc/self/mounts is memory-resident, and matching the parsed
+        # mount sources (plus their partition suffixes) keeps the check
+        # structural instead of substring-scanning whole mount lines
         try:
-            result = subprocess.run(
-                ['mount'], capture_output=True, text=True, check=True
-            )
-            return device_path in result.stdout
-        except:
+            with open('/proc/self/mounts') as f:
+                mounts = {line.split(None, 1)[0] for line in f}
+        except OSError:
             return False
+        return _mounts_include_device(mounts, device_path)
     
     def _is_system_drive(self, device_path: str) -> bool:
         """Check if device appears to be a system drive."""
-        system_drives = ['/dev/sda', '/dev/nvme0n1', '/dev/mmcblk0']
-        return any(device_path.startswith(drive) for drive in system_drives)
+        return _SYS_DRIVE_RE.match(device_path) is not None
     
     def _is_critical_device(self, device_path: str) -> bool:
         """Check if device is critical for system operation."""
-        critical_devices = [
-            '/dev/sda1', '/dev/sda2',  # Common boot partitions
-            '/dev/nvme0n1p1', '/dev/nvme0n1p2',  # NVMe boot partitions
-            '/dev/mmcblk0p1', '/dev/mmcblk0p2',  # eMMC boot partitions
-        ]
-        return device_path in critical_devices
+        return device_path in self._critical
     
     def require_confirmation(self, device_path: str, method: str) -> bool:
         """Require user confirmation for destructive operations."""
+        return self.require_confirmation_batch([device_path], method)
+
+    def require_confirmation_batch(self, devices: List[str], method: str) -> bool:
+        """Confirm a whole batch of destructive operations at once.
+
+        One prompt covers every listed device, so wiping N disks costs one
+        human round-trip instead of N. The confirmation token is derived
+        from the device set and method, making it impossible to confirm a
+        different batch than the one displayed.
+        """
         if not self.safety_checks_enabled:
             return True
-        
+
+        token = hashlib.sha256(
+            (",".join(sorted(devices)) + "|" + method).encode()
+        ).hexdigest()[:12]
+
         print(f"\n⚠️  WARNING: DESTRUCTIVE OPERATION ⚠️")
-        print(f"Device: {device_path}")
+        for device_path in devices:
+            print(f"Device: {device_path}")
         print(f"Method: {method}")
-        print(f"This operation will PERMANENTLY ERASE all data on this device!")
+        print(f"This operation will PERMANENTLY ERASE all data on these devices!" if len(devices) > 1
+              else f"This operation will PERMANENTLY ERASE all data on this device!")
         print(f"This action CANNOT be undone!")
-        
-        response = input("\nAre you absolutely sure you want to proceed? (type 'YES' to confirm): ")
-        return response == "YES"
+
+        response = input(f"\nAre you absolutely sure you want to proceed? (type '{token}' to confirm): ")
+        return response == token
     
     def log_safety_event(self, event: str, device_path: str = None):
         """Log safety-related events."""
         message = f"SAFETY EVENT: {event}"
         if device_path:
             message += f" - Device: {device_path}"
-        
-        self.logger.warning(message)
+
+        with self._log_lock:
+            self.logger.warning(message)
         
         # Could also write to a dedicated safety log file
         # with open("/var/log/shoonya-safety.log", "a") as f:
@@ -8,38 +8,117 @@ including Clear, Purge, and Destroy methods with proper verification and documen
 
 import os
 import json
+import logging
+import re
 import subprocess
+import sys
 import hashlib
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple, Any
-from enum import Enum
-from dataclasses import dataclass
+from enum import IntEnum, StrEnum
+from dataclasses import dataclass, field
+from functools import cache
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm, IntPrompt
-from rich.table import Table
-from rich import box
 
-console = Console()
+@cache
+def _console():
+    """Build the shared console on first use.
 
+    rich is only needed once something is actually printed; deferring the
+    import keeps it off the critical path for callers that just want the
+    enums, dataclasses, or certificate generation.
+    """
+    from rich.console import Console
+    return Console()
 
-class DataSensitivity(Enum):
+# Known manufacturers: one C-level regex scan instead of a per-name substring
+# loop, with canonical casing restored via lookup
+_MFG_RE = re.compile(
+    r"(samsung|intel|western\s+digital|seagate|crucial|kingston|sandisk)", re.I
+)
+_ISO_FMT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+_logger = logging.getLogger("shoonya.nist")
+_logger.addHandler(logging.NullHandler())
+
+# Transport -> NIST media type; anything unknown is assumed magnetic
+_MEDIA_TYPE = {
+    "nvme": "Flash Memory (SSD)",
+    "sata": "Flash Memory (SSD)",
+    "ata": "Flash Memory (SSD)",
+    "usb": "Flash Memory (USB/SCSI)",
+    "scsi": "Flash Memory (USB/SCSI)",
+}
+
+# validate_method_choice warning strings, indexed by condition bit
+_VALIDATION_WARNINGS = (
+    "⚠️  Consider using Purge method for SSDs - Clear may not reach all storage areas",
+    "❌ Cryptographic Erase requires an encrypted drive",
+    "⚠️  WARNING: Data may have been saved before encryption was enabled",
+)
+
+_MFG_CANON = {
+    "samsung": "Samsung",
+    "intel": "Intel",
+    "western digital": "Western Digital",
+    "seagate": "Seagate",
+    "crucial": "Crucial",
+    "kingston": "Kingston",
+    "sandisk": "SanDisk",
+}
+
+
+# Module-level cache: engines are constructed per certificate, so a
+# method-level cache keyed on self would never hit across runs and would
+# pin every engine instance for process lifetime
+@cache
+def _extract_manufacturer(model: str) -> str:
+    """Extract manufacturer from a device model string."""
+    if not model or model == "N/A":
+        return "Unknown"
+
+    m = _MFG_RE.search(model)
+    if m:
+        return _MFG_CANON[" ".join(m.group(1).lower().split())]
+    return "Unknown"
+
+
+class TransportCategory(IntEnum):
+    """Coarse device class, derived once from the transport string."""
+    SSD = 0
+    HDD = 1
+    USB = 2
+    OTHER = 3
+
+
+# Transport string -> category; lowered once at DeviceInfo construction so
+# the hot validation/selection paths compare integers instead of re-lowering
+# and scanning lists
+_TRANSPORT_CATEGORY = {
+    "nvme": TransportCategory.SSD,
+    "sata": TransportCategory.SSD,
+    "ata": TransportCategory.SSD,
+    "usb": TransportCategory.USB,
+    "scsi": TransportCategory.USB,
+}
+
+
+class DataSensitivity(StrEnum):
     """Data sensitivity levels per NIST guidelines."""
     LOW = "Low"
     MODERATE = "Moderate"
     HIGH = "High"
 
 
-class SanitizationMethod(Enum):
+class SanitizationMethod(StrEnum):
     """NIST-sanitization methods."""
     CLEAR = "Clear"
     PURGE = "Purge"
     DESTROY = "Destroy"
 
 
-class SanitizationTechnique(Enum):
+class SanitizationTechnique(StrEnum):
     """Specific sanitization techniques."""
     SINGLE_PASS_OVERWRITE = "Single Pass Overwrite"
     SSD_SECURE_ERASE = "SSD Secure Erase"
@@ -47,9 +126,14 @@ class SanitizationTechnique(Enum):
     PHYSICAL_DESTRUCTION = "Physical Destruction"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceInfo:
-    """Device information structure."""
+    """Device information structure.
+
+    Frozen so instances are hashable and can key caches across the
+    decision -> validate -> execute -> certify flow; use
+    dataclasses.replace() to derive modified copies.
+    """
     name: str
     path: str
     model: str
@@ -59,9 +143,15 @@ class DeviceInfo:
     media_type: str
     is_encrypted: bool = False
     encryption_always_on: bool = False
+    transport_category: TransportCategory = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "transport_category", _TRANSPORT_CATEGORY.get(
+            self.transport.lower(), TransportCategory.OTHER
+        ))
 
 
-@dataclass
+@dataclass(slots=True)
 class SanitizationResult:
     """Result of sanitization operation."""
     success: bool
@@ -73,34 +163,68 @@ class SanitizationResult:
     verification_details: Optional[List[str]] = None
 
 
+# Flowchart outcomes enumerated up front: (will_reuse, sensitivity,
+# leaves_control) -> method. Only Low-sensitivity data staying in physical
+# control qualifies for Clear; anything not reused is destroyed.
+_DECISION_TABLE = {
+    (will_reuse, sensitivity, leaves_control):
+        SanitizationMethod.DESTROY if not will_reuse
+        else SanitizationMethod.CLEAR
+        if sensitivity == DataSensitivity.LOW and not leaves_control
+        else SanitizationMethod.PURGE
+    for will_reuse in (False, True)
+    for sensitivity in DataSensitivity
+    for leaves_control in (False, True)
+}
+
+
 class NISTComplianceEngine:
     """Main engine for NIST SP 800-88r2 compliance."""
     
     def __init__(self):
-        self.console = Console()
+        self.console = _console()
+        # Panel layout/box-drawing only pays off on a terminal; when stdout
+        # is piped (engine/web callers) plain lines are cheaper to render
+        self._interactive = sys.stdin.isatty()
         self.wipe_log = {}
+        # Fields identical for every certificate; copied, not rebuilt, per call
+        self._cert_template = {
+            "tool_used": "Shoonya Wipe v1.0",
+            "verification_method": "Status check and completion verification",
+            "nist_compliance": "SP 800-88r2",
+        }
         
+    def _print_panel(self, message: str, style: str = "") -> None:
+        """Print a message, boxed only when attached to a terminal."""
+        if self._interactive:
+            from rich.panel import Panel
+            self.console.print(Panel.fit(message, style=style))
+        else:
+            self.console.print(message)
+
     def run_nist_decision_flowchart(self, device: DeviceInfo) -> Tuple[SanitizationMethod, SanitizationTechnique]:
         """
         Rule 2.1: Follow the NIST Decision Flowchart (Page 25)
         Implements the official NIST decision process for choosing sanitization methods.
         """
-        self.console.print(Panel.fit(
+        from rich.prompt import Prompt, Confirm
+
+        self._print_panel(
             "🔍 NIST SP 800-88r2 Decision Flowchart\n"
             "Following official guidelines for media sanitization method selection",
             style="bold blue"
-        ))
+        )
         
         # Question 1: Will the drive be reused?
         will_reuse = Confirm.ask("Will the drive be reused after sanitization?")
         
         if not will_reuse:
-            self.console.print(Panel.fit(
+            self._print_panel(
                 "📋 NIST Recommendation: DESTROY\n"
                 "Since the drive will not be reused, physical destruction is recommended.\n"
                 "This makes data recovery infeasible even with specialized equipment.",
                 style="bold red"
-            ))
+            )
             return SanitizationMethod.DESTROY, SanitizationTechnique.PHYSICAL_DESTRUCTION
         
         # Question 2: What is the data sensitivity level?
@@ -115,52 +239,55 @@ class NISTComplianceEngine:
             default="moderate"
         )
         
-        sensitivity = DataSensitivity(sensitivity_choice.upper())
+        sensitivity = DataSensitivity[sensitivity_choice.upper()]
         
         # Question 3: Will the drive leave your physical control?
         leaves_control = Confirm.ask("Will the drive leave your physical control?")
         
         # NIST Decision Logic
-        if sensitivity == DataSensitivity.LOW and not leaves_control:
-            method = SanitizationMethod.CLEAR
-            technique = SanitizationTechnique.SINGLE_PASS_OVERWRITE
-        elif sensitivity == DataSensitivity.LOW and leaves_control:
-            method = SanitizationMethod.PURGE
-            technique = self._select_purge_technique(device)
-        elif sensitivity in [DataSensitivity.MODERATE, DataSensitivity.HIGH]:
-            method = SanitizationMethod.PURGE
-            technique = self._select_purge_technique(device)
-        else:
-            # Fallback to Purge for safety
-            method = SanitizationMethod.PURGE
-            technique = self._select_purge_technique(device)
-        
+        method, technique = self.decide(device, True, sensitivity, leaves_control)
+
         self._display_recommendation(method, technique, sensitivity, leaves_control)
         return method, technique
-    
+
+    def decide(self, device: DeviceInfo, will_reuse: bool,
+               sensitivity: DataSensitivity,
+               leaves_control: bool) -> Tuple[SanitizationMethod, SanitizationTechnique]:
+        """Non-interactive decision fast path.
+
+        Callers that already know the three flowchart answers (API and
+        batch use) get the method from a precomputed lookup table instead
+        of the prompting flowchart. The technique for Purge still depends
+        on the device's encryption state.
+        """
+        method = _DECISION_TABLE[(will_reuse, sensitivity, leaves_control)]
+        if method == SanitizationMethod.DESTROY:
+            return method, SanitizationTechnique.PHYSICAL_DESTRUCTION
+        if method == SanitizationMethod.CLEAR:
+            return method, SanitizationTechnique.SINGLE_PASS_OVERWRITE
+        return method, self._select_purge_technique(device)
+
     def _select_purge_technique(self, device: DeviceInfo) -> SanitizationTechnique:
         """Select appropriate Purge technique based on device type and encryption status."""
-        transport = device.transport.lower()
-        
         # Rule 1.2: Implement the "Purge" Method
-        if transport in ["nvme", "sata", "ata"] and device.is_encrypted:
+        if device.transport_category == TransportCategory.SSD and device.is_encrypted:
             # Rule 2.2: Follow Rules for Cryptographic Erase
             if device.encryption_always_on:
-                self.console.print(Panel.fit(
+                self._print_panel(
                     "✅ Cryptographic Erase Recommended\n"
                     "Device was always encrypted from the start - CE is safe to use.",
                     style="bold green"
-                ))
+                )
                 return SanitizationTechnique.CRYPTOGRAPHIC_ERASE
             else:
-                self.console.print(Panel.fit(
+                self._print_panel(
                     "⚠️  WARNING: Cryptographic Erase NOT Recommended\n"
                     "Sensitive data may have been saved before encryption was enabled.\n"
                     "Using SSD Secure Erase instead for safety.",
                     style="bold yellow"
-                ))
+                )
                 return SanitizationTechnique.SSD_SECURE_ERASE
-        elif transport in ["nvme", "sata", "ata"]:
+        elif device.transport_category == TransportCategory.SSD:
             return SanitizationTechnique.SSD_SECURE_ERASE
         else:
             # Fallback to single pass overwrite for other devices
@@ -188,34 +315,34 @@ class NISTComplianceEngine:
         if leaves_control:
             justification.append("• Required when drive leaves physical control")
         
-        self.console.print(Panel.fit(
+        self._print_panel(
             f"📋 NIST Recommendation: {method.value}\n"
             f"Technique: {technique.value}\n\n"
             "Justification:\n" + "\n".join(justification),
             style="bold green"
-        ))
+        )
     
     def execute_clear_method(self, device: DeviceInfo) -> SanitizationResult:
         """
         Rule 1.1: Implement the "Clear" Method (Page 17)
         Single-pass overwrite for basic data protection.
         """
-        self.console.print(Panel.fit(
+        self._print_panel(
             "🧹 Executing NIST Clear Method\n"
             "Single-pass overwrite for basic data protection",
             style="bold blue"
-        ))
+        )
         
         # Rule 1.1: Warn about SSD limitations
-        if device.transport.lower() in ["nvme", "sata", "ata"]:
-            self.console.print(Panel.fit(
+        if device.transport_category == TransportCategory.SSD:
+            self._print_panel(
                 "⚠️  SSD Warning\n"
                 "Clear method may not work perfectly on modern SSDs due to:\n"
                 "• Spare storage areas that overwriting might not reach\n"
                 "• Wear leveling algorithms\n"
                 "• Consider using Purge method for better security",
                 style="bold yellow"
-            ))
+            )
         
         # Simulate single-pass overwrite (in real implementation, this would be actual overwrite)
         self.console.print("🔄 Performing single-pass overwrite...")
@@ -226,7 +353,7 @@ class NISTComplianceEngine:
             method=SanitizationMethod.CLEAR,
             technique=SanitizationTechnique.SINGLE_PASS_OVERWRITE,
             verification_status="pending",
-            completion_time=datetime.utcnow()
+            completion_time=datetime.now(timezone.utc)
         )
     
     def execute_purge_method(self, device: DeviceInfo, technique: SanitizationTechnique) -> SanitizationResult:
@@ -234,11 +361,11 @@ class NISTComplianceEngine:
         Rule 1.2: Implement the "Purge" Method (Page 19)
         Advanced techniques for making data recovery infeasible.
         """
-        self.console.print(Panel.fit(
+        self._print_panel(
             "🔒 Executing NIST Purge Method\n"
             f"Technique: {technique.value}",
             style="bold blue"
-        ))
+        )
         
         if technique == SanitizationTechnique.SSD_SECURE_ERASE:
             return self._execute_ssd_secure_erase(device)
@@ -262,7 +389,7 @@ class NISTComplianceEngine:
             method=SanitizationMethod.PURGE,
             technique=SanitizationTechnique.SSD_SECURE_ERASE,
             verification_status="pending",
-            completion_time=datetime.utcnow()
+            completion_time=datetime.now(timezone.utc)
         )
     
     def _execute_cryptographic_erase(self, device: DeviceInfo) -> SanitizationResult:
@@ -279,7 +406,7 @@ class NISTComplianceEngine:
             method=SanitizationMethod.PURGE,
             technique=SanitizationTechnique.CRYPTOGRAPHIC_ERASE,
             verification_status="pending",
-            completion_time=datetime.utcnow()
+            completion_time=datetime.now(timezone.utc)
         )
     
     def verify_sanitization(self, device: DeviceInfo, result: SanitizationResult) -> bool:
@@ -287,11 +414,11 @@ class NISTComplianceEngine:
         Rule 3.1: Perform Sanitization Verification (Page 29)
         Verify that the sanitization process completed successfully.
         """
-        self.console.print(Panel.fit(
+        self._print_panel(
             "✅ NIST Verification Process\n"
             "Checking sanitization completion status",
             style="bold blue"
-        ))
+        )
         
         # Rule 3.1: Get completion status from drive
         verification_passed = True
@@ -351,26 +478,29 @@ class NISTComplianceEngine:
         Rule 3.2: Help the User with Validation (Page 29)
         Validate that the chosen method is appropriate for the device and data.
         """
-        warnings = []
-        
-        # Check for inappropriate method choices
-        if device.transport.lower() in ["nvme", "sata", "ata"] and method == SanitizationMethod.CLEAR:
-            warnings.append("⚠️  Consider using Purge method for SSDs - Clear may not reach all storage areas")
-        
-        if technique == SanitizationTechnique.CRYPTOGRAPHIC_ERASE and not device.is_encrypted:
-            warnings.append("❌ Cryptographic Erase requires an encrypted drive")
-            return False
-        
-        if technique == SanitizationTechnique.CRYPTOGRAPHIC_ERASE and not device.encryption_always_on:
-            warnings.append("⚠️  WARNING: Data may have been saved before encryption was enabled")
-        
-        if warnings:
-            self.console.print(Panel.fit(
-                "Validation Warnings:\n" + "\n".join(warnings),
-                style="bold yellow"
-            ))
-        
-        return True
+        # Check for inappropriate method choices; each condition sets a bit
+        # that indexes the precomputed warning strings
+        is_ce = technique == SanitizationTechnique.CRYPTOGRAPHIC_ERASE
+        flags = (
+            (device.transport_category == TransportCategory.SSD
+             and method == SanitizationMethod.CLEAR)
+            | (is_ce and not device.is_encrypted) << 1
+            | (is_ce and not device.encryption_always_on) << 2
+        )
+
+        if flags:
+            warnings = [w for i, w in enumerate(_VALIDATION_WARNINGS) if flags >> i & 1]
+            if self._interactive:
+                self._print_panel(
+                    "Validation Warnings:\n" + "\n".join(warnings),
+                    style="bold yellow"
+                )
+            else:
+                # Nobody is reading a panel; one log line, no layout work
+                _logger.warning("; ".join(warnings))
+
+        # Bit 1 (CE on an unencrypted drive) is the only hard failure
+        return not flags >> 1 & 1
     
     def generate_nist_certificate(self, device: DeviceInfo, result: SanitizationResult, 
                                 operator_name: str, operator_title: str) -> Dict[str, Any]:
@@ -378,65 +508,47 @@ class NISTComplianceEngine:
         Rule 4.1: Include All Required Fields in Certificates (Page 30)
         Generate NIST-compliant certificate with all required fields.
         """
-        certificate = {
+        # One aware timestamp formatted once; utcnow() was naive and the
+        # literal Z suffix claimed a timezone it did not have
+        now_iso = datetime.now(timezone.utc).strftime(_ISO_FMT)
+        certificate = self._cert_template.copy()
+        certificate.update({
             # Required NIST fields (Section 4.6)
-            "manufacturer": self._extract_manufacturer(device.model),
+            "manufacturer": _extract_manufacturer(device.model),
             "model": device.model,
             "serial_number": device.serial,
             "media_type": self._determine_media_type(device.transport),
             "sanitization_method": result.method.value,
             "sanitization_technique": result.technique.value,
-            "tool_used": f"Shoonya Wipe v1.0",
-            "verification_method": "Status check and completion verification",
             "operator_name": operator_name,
             "operator_title": operator_title,
-            "date": datetime.utcnow().isoformat() + "Z",
-            
+            "date": now_iso,
+
             # Additional useful information
             "device_path": device.path,
             "device_size": device.size,
             "verification_status": result.verification_status,
             "verification_details": result.verification_details or [],
-            "completion_time": result.completion_time.isoformat() + "Z" if result.completion_time else None,
-            "certificate_id": str(uuid.uuid4()),
-            "nist_compliance": "SP 800-88r2",
-        }
-        
+            "completion_time": result.completion_time.strftime(_ISO_FMT) if result.completion_time else None,
+            "certificate_id": uuid.uuid4().hex,
+        })
+
         return certificate
     
-    def _extract_manufacturer(self, model: str) -> str:
-        """Extract manufacturer from device model string."""
-        if not model or model == "N/A":
-            return "Unknown"
-        
-        # Common manufacturer prefixes
-        manufacturers = ["Samsung", "Intel", "Western Digital", "Seagate", "Crucial", "Kingston", "SanDisk"]
-        for mfg in manufacturers:
-            if mfg.lower() in model.lower():
-                return mfg
-        
-        return "Unknown"
-    
     def _determine_media_type(self, transport: str) -> str:
         """Determine media type based on transport."""
-        transport_lower = transport.lower()
-        if transport_lower in ["nvme", "sata", "ata"]:
-            return "Flash Memory (SSD)"
-        elif transport_lower in ["usb", "scsi"]:
-            return "Flash Memory (USB/SCSI)"
-        else:
-            return "Magnetic"  # Default assumption
+        return _MEDIA_TYPE.get(transport.lower(), "Magnetic")
     
     def recommend_destroy_method(self) -> None:
         """
         Rule 1.3: Recommend the "Destroy" Method (Page 19)
         Guide users on physical destruction methods.
         """
-        self.console.print(Panel.fit(
+        self._print_panel(
             "💥 NIST Destroy Method Recommendation\n"
             "Physical destruction makes data recovery impossible",
             style="bold red"
-        ))
+        )
         
         self.console.print("\n[bold]Recommended destruction methods:[/bold]")
         self.console.print("• Shredding: Use industrial shredders designed for electronic media")
@@ -490,13 +602,13 @@ def main():
             device, result, "John Doe", "IT Security Specialist"
         )
         
-        console.print(Panel.fit(
+        engine._print_panel(
             f"📄 NIST-Compliant Certificate Generated\n"
             f"Method: {certificate['sanitization_method']}\n"
             f"Technique: {certificate['sanitization_technique']}\n"
             f"Verification: {certificate['verification_status']}",
             style="bold green"
-        ))
+        )
 
 
 if __name__ == "__main__":
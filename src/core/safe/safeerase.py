@@ -12,21 +12,37 @@ Features:
 Compliance: Follows NIST SP 800-88r2 guidelines for media sanitization.
 """
 
+import io
 import json
 import os
+import re
 import subprocess
 import sys
-from datetime import datetime
+import textwrap
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import SimpleNamespace
 import base64
 import hashlib
 import uuid
 import platform
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
-from rich import box
+# Rust-backed serializer, ~2-5x faster than stdlib json on these
+# payloads; optional so a bare install still produces logs
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# RFC 8785 (JCS) canonicalizer: C-backed, and the bytes are reproducible
+# from any language, which matters for external verifiers. Optional; the
+# signature block records which canonicalizer produced the signed bytes.
+try:
+    import rfc8785  # type: ignore
+except ImportError:
+    rfc8785 = None
+
 import shutil
 
 # Import NIST compliance engine
@@ -36,41 +52,89 @@ from .nist_compliance import (
 )
 
 
-console = Console()
+@lru_cache(maxsize=1)
+def _console():
+    """Lazy shared console: rich costs ~80ms to import, which callers
+    that only want fetch_block_devices or sign_json shouldn't pay."""
+    from rich.console import Console
+
+    return Console()
 
 
-def run_command(cmd: str, description: str = "") -> str | None:
+def run_command(cmd: list[str] | str, description: str = "") -> str | None:
     try:
+        # Argv lists skip the /bin/sh fork and exec entirely; string
+        # commands are split the same way for backward compatibility
         result = subprocess.run(
-            cmd,
-            shell=True,
+            cmd if isinstance(cmd, list) else cmd.split(),
             capture_output=True,
             text=True,
             timeout=15,
         )
         if result.returncode == 0:
             return result.stdout.strip()
-        console.print(f"[red]Error running {description}: {result.stderr}[/red]")
+        # Plain stderr keeps this helper usable without importing rich
+        print(f"Error running {description}: {result.stderr}", file=sys.stderr)
         return None
     except subprocess.TimeoutExpired:
-        console.print(f"[red]Timeout running {description}[/red]")
+        print(f"Timeout running {description}", file=sys.stderr)
         return None
     except Exception as exc:  # noqa: BLE001
-        console.print(f"[red]Exception running {description}: {exc}[/red]")
+        print(f"Exception running {description}: {exc}", file=sys.stderr)
         return None
 
 
+# lsblk spawn + JSON parse is the dominant cost of a device refresh, and
+# the CLI calls it several times per session (listing, selection, verify);
+# a short TTL keeps repeats free while still noticing hotplug quickly.
+_LSBLK_CACHE_TTL = 2.0
+_LSBLK_CACHE = {"ts": 0.0, "data": None}
+
+
+def invalidate_device_cache() -> None:
+    """Force the next fetch_block_devices() call to re-run lsblk."""
+    _LSBLK_CACHE["ts"] = 0.0
+    _LSBLK_CACHE["data"] = None
+
+
+# KEY="value" pairs from `lsblk -P`; the value group admits backslash
+# escapes so embedded quotes in model strings don't truncate the match
+_LSBLK_PAIR_RE = re.compile(r'([A-Z:]+)="((?:[^"\\]|\\.)*)"')
+
+
+def _parse_pairs(output: str) -> list[dict]:
+    """Parse `lsblk -P` output into the same shape as the -J device list.
+
+    Old util-linux builds lack JSON support; -P predates it by years. Keys
+    are lowercased to match the JSON schema so callers see one format.
+    """
+    devices: list[dict] = []
+    for line in output.splitlines():
+        pairs = _LSBLK_PAIR_RE.findall(line)
+        if pairs:
+            devices.append(
+                {k.lower(): v.replace('\\"', '"') for k, v in pairs}
+            )
+    return devices
+
+
 def fetch_block_devices() -> list[dict]:
     """Return lsblk JSON list of blockdevices with useful fields.
 
     Use either -o (specific columns) or -O (all), not both. Try -o first,
     then fall back to -O, then plain -J.
     """
+    if (
+        _LSBLK_CACHE["data"] is not None
+        and time.monotonic() - _LSBLK_CACHE["ts"] < _LSBLK_CACHE_TTL
+    ):
+        return _LSBLK_CACHE["data"]
+
     columns = "NAME,KNAME,PATH,SIZE,TYPE,MODEL,SERIAL,TRAN,MOUNTPOINT"
     candidates = [
-        f"lsblk -J -o {columns}",  # preferred
-        "lsblk -J -O",             # all columns
-        "lsblk -J",                # minimal
+        ["lsblk", "-J", "-o", columns],  # preferred
+        ["lsblk", "-J", "-O"],           # all columns
+        ["lsblk", "-J"],                 # minimal
     ]
     for cmd in candidates:
         output = run_command(cmd, "lsblk")
@@ -78,24 +142,47 @@ def fetch_block_devices() -> list[dict]:
             continue
         try:
             data = json.loads(output)
-            return data.get("blockdevices", [])
+            devices = data.get("blockdevices", [])
+            _LSBLK_CACHE["ts"] = time.monotonic()
+            _LSBLK_CACHE["data"] = devices
+            return devices
         except json.JSONDecodeError:
             continue
-    console.print("[red]Failed to parse lsblk JSON output[/red]")
+
+    # Last resort: -P key="value" pairs for lsblk builds without -J
+    output = run_command(["lsblk", "-P", "-o", columns], "lsblk")
+    if output:
+        devices = _parse_pairs(output)
+        if devices:
+            _LSBLK_CACHE["ts"] = time.monotonic()
+            _LSBLK_CACHE["data"] = devices
+            return devices
+
+    print("Failed to parse lsblk JSON output", file=sys.stderr)
     return []
 
 
+# Only whole disks are wipe candidates; partitions/loops are skipped
+_DISK_TYPES = frozenset({"disk"})
+
+
 def flatten_devices(devices: list[dict]) -> list[dict]:
     """Flatten parent/child lsblk tree into a single list of top-level disks only."""
-    flat: list[dict] = []
-    for dev in devices:
-        # Only consider disk or removable devices; skip partitions/loops by default
-        if dev.get("type") in {"disk"}:
-            flat.append(dev)
-    return flat
+    # Single comprehension pass against a constant frozenset instead of
+    # rebuilding the set literal and appending per device
+    return [dev for dev in devices if dev.get("type") in _DISK_TYPES]
+
+
+# Column order for the device table; render_table builds each row from
+# this one tuple instead of eight individual .get chains
+_ROW_KEYS = ("name", "path", "size", "type", "model", "serial", "tran")
 
 
 def render_table(devices: list[dict]) -> None:
+    from rich import box
+    from rich.table import Table
+
+    console = _console()
     table = Table(
         title="🔍 Shoonya Wipe - Device Selection (Non-destructive)",
         box=box.SIMPLE_HEAVY,
@@ -109,44 +196,50 @@ def render_table(devices: list[dict]) -> None:
     table.add_column("Serial", style="white")
     table.add_column("Tran", style="yellow")
 
+    add_row = table.add_row
     for idx, dev in enumerate(devices, start=1):
-        table.add_row(
-            str(idx),
-            dev.get("name", "N/A"),
-            dev.get("path", dev.get("kname", "N/A")),
-            dev.get("size", "N/A"),
-            dev.get("type", "N/A"),
-            dev.get("model", "N/A") or "N/A",
-            dev.get("serial", "N/A") or "N/A",
-            dev.get("tran", "N/A") or "N/A",
-        )
+        vals = [dev.get(k) or "N/A" for k in _ROW_KEYS]
+        if vals[1] == "N/A":
+            vals[1] = dev.get("kname") or "N/A"
+        add_row(str(idx), *vals)
     console.print(table)
 
 
 def select_device_interactive(devices: list[dict]) -> dict | None:
     if not devices:
-        console.print("[yellow]No eligible block devices found.[/yellow]")
+        _console().print("[yellow]No eligible block devices found.[/yellow]")
         return None
 
+    # Piped input with one candidate: skip the prompt round-trip entirely
+    if len(devices) == 1 and not sys.stdin.isatty():
+        return devices[0]
+
+    from rich.prompt import Prompt
+
+    console = _console()
     render_table(devices)
 
+    # One lookup table instead of isdigit/int/range checks per attempt;
+    # matters when scripted input re-enters the prompt in a tight loop
+    valid = {str(i): dev for i, dev in enumerate(devices, start=1)}
+
     while True:
         choice = Prompt.ask(
             "Enter device number to select (or 'q' to quit)", default="q"
-        )
-        if choice.lower() == "q":
+        ).strip().lower()
+        if choice == "q":
             return None
-        if not choice.isdigit():
-            console.print("[red]Please enter a valid number[/red]")
-            continue
-        idx = int(choice)
-        if idx < 1 or idx > len(devices):
-            console.print("[red]Out of range[/red]")
-            continue
-        return devices[idx - 1]
+        dev = valid.get(choice)
+        if dev is not None:
+            return dev
+        console.print("[red]Please enter a valid number[/red]")
 
 
 def double_confirm(selected: dict) -> bool:
+    from rich.panel import Panel
+    from rich.prompt import Confirm, Prompt
+
+    console = _console()
     path = selected.get("path") or f"/dev/{selected.get('name')}"
     console.print(Panel.fit(
         f"You selected: [bold]{path}[/bold]\n"
@@ -199,6 +292,51 @@ def select_wipe_method(device_info: dict) -> list[str]:
     return ["blkdiscard"]
 
 
+@lru_cache(maxsize=1)
+def _rl() -> SimpleNamespace:
+    """Import reportlab once and hand the submodules to every renderer.
+
+    The first `from reportlab...` costs ~150ms of module parsing; with
+    one cached namespace both PDF paths share that hit and skip the
+    per-call import-system lookups. Raises ImportError when reportlab
+    is missing — callers keep their existing error handling.
+    """
+    from reportlab.lib.pagesizes import A4  # type: ignore
+    from reportlab.pdfgen import canvas  # type: ignore
+    from reportlab.lib.units import mm  # type: ignore
+    from reportlab.lib import colors  # type: ignore
+    return SimpleNamespace(A4=A4, canvas=canvas, mm=mm, colors=colors)
+
+
+@lru_cache(maxsize=1)
+def _crypto() -> SimpleNamespace:
+    """Same one-shot import pattern for the PyCryptodome pieces."""
+    from Crypto.PublicKey import RSA  # type: ignore
+    from Crypto.Signature import pss  # type: ignore
+    return SimpleNamespace(RSA=RSA, pss=pss)
+
+
+def _utcnow_iso() -> str:
+    """Aware-UTC timestamp with the trailing Z the log schema uses.
+
+    datetime.utcnow() is deprecated in 3.12 and naive; this is also
+    cheaper than full-microsecond isoformat on the per-command path.
+    """
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+# Host facts are immutable for the life of the process; platform.platform()
+# in particular shells out to uname on first call, so capture once rather
+# than per log. cwd can change, so init_log reads it fresh.
+_ENV = {
+    "inside_docker": os.path.exists("/.dockerenv"),
+    "host": platform.node(),
+    "os": platform.platform(),
+    "kernel": platform.release(),
+    "python": platform.python_version(),
+}
+
+
 def ensure_out_dir() -> str:
     out_dir = os.path.join(os.getcwd(), "out")
     os.makedirs(out_dir, exist_ok=True)
@@ -206,7 +344,7 @@ def ensure_out_dir() -> str:
 
 
 def init_log(selected: dict, method: list[str]) -> dict:
-    now = datetime.utcnow().isoformat() + "Z"
+    now = _utcnow_iso()
     log: dict = {
         "wipe_id": str(uuid.uuid4()),
         "device": selected.get("path") or f"/dev/{selected.get('name')}",
@@ -219,45 +357,161 @@ def init_log(selected: dict, method: list[str]) -> dict:
         "commands": [],
         "timestamp_start": now,
         "timestamp_end": None,
-        "environment": {
-            "cwd": os.getcwd(),
-            "inside_docker": os.path.exists("/.dockerenv"),
-            "host": platform.node(),
-            "os": platform.platform(),
-            "kernel": platform.release(),
-            "python": platform.python_version(),
-        },
+        "environment": {"cwd": os.getcwd(), **_ENV},
     }
     return log
 
 
+# In-flight command history is bounded so a verification pass that runs
+# thousands of reads can't grow the log (and every re-serialization of
+# it) without limit; the full detail lives in the append-only sidecar
+# and the hash chain still covers every entry ever logged.
+_MAX_INFLIGHT_COMMANDS = 10_000
+_COMMANDS_SIDECAR = "commands.ndjson"
+
+
 def log_command(log: dict, cmd: list[str] | str, returncode: int, stdout: str, stderr: str) -> None:
-    log["commands"].append(
-        {
-            "cmd": cmd if isinstance(cmd, str) else " ".join(cmd),
-            "returncode": returncode,
-            "stdout": stdout,
-            "stderr": stderr,
-            "ts": datetime.utcnow().isoformat() + "Z",
-        }
-    )
+    entry = {
+        "cmd": cmd if isinstance(cmd, str) else " ".join(cmd),
+        "returncode": returncode,
+        "stdout": stdout,
+        "stderr": stderr,
+        "ts": _utcnow_iso(),
+    }
+    entry_bytes = serialize_log(entry)
+
+    commands = log["commands"]
+    if len(commands) >= _MAX_INFLIGHT_COMMANDS:
+        commands.pop(0)  # ring semantics: keep the most recent entries
+    commands.append(entry)
+
+    # Rolling digest chains each entry onto the previous state, so the
+    # certificate can attest the complete history without carrying it
+    log["commands_digest"] = hashlib.sha256(
+        log.get("commands_digest", "").encode("ascii") + entry_bytes
+    ).hexdigest()
+
+    # Append-only sidecar keeps full detail with one write per command
+    # instead of re-serializing the whole log
+    try:
+        with open(os.path.join(ensure_out_dir(), _COMMANDS_SIDECAR), "ab") as f:
+            f.write(entry_bytes + b"\n")
+    except OSError:
+        pass
+
+
+def _sendfile_copy(src: str, dst: str) -> str:
+    """Copy src to dst without moving bytes through userspace.
+
+    Same-filesystem exports are satisfied with a hardlink — zero copy,
+    shared inode, identical metadata. Across filesystems (or when dst
+    already exists) os.sendfile keeps the copy in kernel space instead
+    of bouncing each chunk through a buffer the way shutil.copy2 does.
+    """
+    try:
+        os.link(src, dst)
+        return dst
+    except OSError:
+        pass
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        shutil.copy2(src, dst)
+    return dst
+
+
+def export_artifacts(paths: list[str], export_dir: str) -> list[str]:
+    """Copy wipe artifacts into export_dir, overlapping the copies.
+
+    The log, signed log and PDF are independent files, so their export
+    copies are submitted together to a small thread pool rather than
+    copied one at a time; exports often land on slow removable media
+    where overlapping the I/O matters.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    jobs = [
+        (p, os.path.join(export_dir, os.path.basename(p)))
+        for p in paths
+        if p and os.path.exists(p)
+    ]
+    if len(jobs) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            return list(pool.map(lambda job: _sendfile_copy(*job), jobs))
+    return [_sendfile_copy(src, dst) for src, dst in jobs]
+
+
+def serialize_log(log: dict) -> bytes:
+    """Canonical JSON bytes: sorted keys, no whitespace.
+
+    This is the exact form the signature covers, so producing it once
+    and reusing it for both hashing and the disk write keeps the two
+    guaranteed-identical and saves a serializer pass. verify.py mirrors
+    this function; keep the two in sync.
+    """
+    if rfc8785 is not None:
+        return rfc8785.dumps(log)
+    if orjson is not None:
+        return orjson.dumps(log, option=orjson.OPT_SORT_KEYS)
+    # ensure_ascii=False matches orjson's raw UTF-8 output, so a log
+    # signed with one serializer verifies with the other
+    return json.dumps(
+        log, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def write_bytes(data: bytes, filename: str = "wipelog.json") -> str:
+    out_dir = ensure_out_dir()
+    path = os.path.join(out_dir, filename)
+    # Write-then-rename gives every log a fresh inode, so exported
+    # hardlinks of earlier runs are never truncated underneath
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
 
 
 def write_log(log: dict, filename: str = "wipelog.json") -> str:
+    """Write an indented, human-readable log copy.
+
+    The CLI pipeline uses serialize_log/write_bytes; this stays for
+    callers that want a pretty-printed file.
+    """
     out_dir = ensure_out_dir()
     path = os.path.join(out_dir, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(log, f, indent=2)
+    tmp = path + ".tmp"
+    if orjson is not None:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(log, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(log, f, indent=2)
+    os.replace(tmp, path)
     return path
 
 
 # -------- Phase 4: JSON signing (dev keys) -------- #
+@lru_cache(maxsize=1)
 def ensure_dev_keys() -> tuple[str, str]:
-    """Create RSA dev keypair if missing. Returns (private_path, public_path)."""
+    """Create RSA dev keypair if missing. Returns (private_path, public_path).
+
+    Cached: the makedirs/exists probes (and the one-off RSA generation)
+    only run once per process. Rotating keys on disk requires clearing
+    this cache and _load_signing_key's.
+    """
     try:
-        from Crypto.PublicKey import RSA  # type: ignore
+        RSA = _crypto().RSA
     except Exception:
-        console.print("[red]PyCryptodome not installed. Cannot sign logs.[/red]")
+        _console().print("[red]PyCryptodome not installed. Cannot sign logs.[/red]")
         return "", ""
 
     keys_dir = os.path.join(os.getcwd(), "keys")
@@ -273,33 +527,99 @@ def ensure_dev_keys() -> tuple[str, str]:
     return priv_path, pub_path
 
 
-def sign_json(json_obj: dict) -> dict:
-    """Return a new object with signature fields added (dev only)."""
-    from Crypto.PublicKey import RSA  # type: ignore
-    from Crypto.Signature import pss  # type: ignore
-    from Crypto.Hash import SHA256  # type: ignore
+@lru_cache(maxsize=1)
+def _load_signing_key():
+    """Load the dev signing key once per process.
+
+    RSA.import_key re-parses PEM and rebuilds the key object on every
+    call; the keypair is immutable on disk, so sign_json only pays that
+    cost (and two file reads) the first time. Returns (key, fingerprint)
+    or None when signing is unavailable.
+    """
+    RSA = _crypto().RSA
 
     priv_path, pub_path = ensure_dev_keys()
     if not priv_path or not os.path.exists(priv_path):
-        return json_obj
+        return None
+    with open(priv_path, "rb") as f:
+        key = RSA.import_key(f.read())
+    with open(pub_path, "rb") as f:
+        pub_fingerprint = hashlib.sha256(f.read()).hexdigest()[:16]
+    return key, pub_fingerprint
 
-    data_bytes = json.dumps(json_obj, separators=(",", ":"), sort_keys=True).encode(
-        "utf-8"
-    )
-    h = SHA256.new(data_bytes)
-    key = RSA.import_key(open(priv_path, "rb").read())
-    signature = pss.new(key).sign(h)
-    sig_b64 = base64.b64encode(signature).decode("ascii")
 
-    pub_bytes = open(pub_path, "rb").read()
-    pub_fingerprint = hashlib.sha256(pub_bytes).hexdigest()[:16]
+class _OpenSSLSHA256:
+    """hashlib.sha256 behind PyCryptodome's hash interface.
 
-    signed = dict(json_obj)  # shallow copy
-    signed["signature"] = {
+    The stdlib hash is OpenSSL-backed and uses SHA-NI where the CPU has
+    it, which matters for the large canonical-JSON digests sign_json
+    feeds it; PyCryptodome's own SHA256 stays on the scalar path. Only
+    the surface pss.sign touches (digest_size, digest, new) is exposed.
+    Signatures verify identically — the digest bytes are the same.
+    """
+
+    digest_size = 32
+    oid = "2.16.840.1.101.3.4.2.1"
+
+    def __init__(self, data: bytes = b""):
+        self._h = hashlib.sha256(data)
+
+    def update(self, data: bytes) -> None:
+        self._h.update(data)
+
+    def digest(self) -> bytes:
+        return self._h.digest()
+
+    def hexdigest(self) -> str:
+        return self._h.hexdigest()
+
+    def new(self, data: bytes = b"") -> "_OpenSSLSHA256":
+        return _OpenSSLSHA256(data)
+
+
+def _signature_for(canonical: bytes) -> dict | None:
+    """Signature fields for already-canonical bytes, or None when the
+    dev keypair is unavailable."""
+    loaded = _load_signing_key()
+    if loaded is None:
+        return None
+    key, pub_fingerprint = loaded
+    signature = _crypto().pss.new(key).sign(_OpenSSLSHA256(canonical))
+    return {
         "alg": "RSA-PSS-SHA256",
-        "sig_b64": sig_b64,
+        # Which canonical form the signature covers; verifiers must
+        # reproduce the payload bytes with the same scheme
+        "canon": "jcs" if rfc8785 is not None else "json",
+        "sig_b64": base64.b64encode(signature).decode("ascii"),
         "pubkey_sha256_16": pub_fingerprint,
     }
+
+
+def sign_bytes(canonical: bytes, log: dict) -> bytes:
+    """Sign canonical bytes of log and return canonical signed bytes.
+
+    canonical must be serialize_log(log); reusing it avoids serializing
+    the payload again just to hash it. The signature field is spliced in
+    and removed so the caller's dict is left untouched without paying
+    for a copy.
+    """
+    sig = _signature_for(canonical)
+    if sig is None:
+        return canonical
+    log["signature"] = sig
+    try:
+        return serialize_log(log)
+    finally:
+        del log["signature"]
+
+
+def sign_json(json_obj: dict) -> dict:
+    """Return a new object with signature fields added (dev only)."""
+    sig = _signature_for(serialize_log(json_obj))
+    if sig is None:
+        return json_obj
+    signed = dict(json_obj)  # shallow copy
+    signed["signature"] = sig
     return signed
 
 
@@ -307,20 +627,22 @@ def sign_json(json_obj: dict) -> dict:
 def render_pdf_certificate(signed_log: dict) -> str:
     """Legacy PDF certificate - use render_nist_pdf_certificate instead."""
     try:
-        from reportlab.lib.pagesizes import A4  # type: ignore
-        from reportlab.pdfgen import canvas  # type: ignore
-        from reportlab.lib.units import mm  # type: ignore
+        rl = _rl()
     except Exception as e:
-        console.print(f"[red]reportlab not installed. Cannot create PDF certificate: {e}[/red]")
+        _console().print(f"[red]reportlab not installed. Cannot create PDF certificate: {e}[/red]")
         return ""
+    A4, mm = rl.A4, rl.mm
 
     out_dir = ensure_out_dir()
     pdf_path = os.path.join(out_dir, "certificate.pdf")
+    # Draw-then-rename gives every certificate a fresh inode, so
+    # exported hardlinks of earlier runs are never truncated underneath
+    tmp_path = pdf_path + ".tmp"
 
     try:
-        c = canvas.Canvas(pdf_path, pagesize=A4)
+        c = rl.canvas.Canvas(tmp_path, pagesize=A4)
     except Exception as e:
-        console.print(f"[red]Failed to create certificate PDF at {pdf_path}: {e}[/red]")
+        _console().print(f"[red]Failed to create certificate PDF at {pdf_path}: {e}[/red]")
         return ""
     width, height = A4
 
@@ -335,7 +657,7 @@ def render_pdf_certificate(signed_log: dict) -> str:
         c.drawString(20 * mm, y, text)
         y -= 7 * mm
 
-    line(f"Generated: {datetime.utcnow().isoformat()}Z")
+    line(f"Generated: {_utcnow_iso()}")
     line(f"Device: {signed_log.get('device')}")
     line(f"Model: {signed_log.get('model')}  Serial: {signed_log.get('serial')}")
     line(f"Transport: {signed_log.get('tran')}  Size: {signed_log.get('size')}")
@@ -355,163 +677,253 @@ def render_pdf_certificate(signed_log: dict) -> str:
     c.showPage()
     try:
         c.save()
+        os.replace(tmp_path, pdf_path)
     except Exception as e:
-        console.print(f"[red]Failed to save certificate PDF: {e}[/red]")
+        _console().print(f"[red]Failed to save certificate PDF: {e}[/red]")
         return ""
     return pdf_path
 
 
-def render_nist_pdf_certificate(certificate: dict) -> str:
-    """
-    Rule 4.1: Include All Required Fields in Certificates (Page 30)
-    Generate NIST-compliant PDF certificate with all required fields.
+# Certificate field rows: (label drawn in the static template, dict key
+# stamped by the per-wipe overlay). Order fixes the page layout.
+_CERT_REQUIRED_FIELDS = (
+    ("Manufacturer", "manufacturer"),
+    ("Model", "model"),
+    ("Serial Number", "serial_number"),
+    ("Media Type", "media_type"),
+    ("Sanitization Method", "sanitization_method"),
+    ("Sanitization Technique", "sanitization_technique"),
+    ("Tool Used", "tool_used"),
+    ("Verification Method", "verification_method"),
+    ("Operator Name", "operator_name"),
+    ("Operator Title", "operator_title"),
+    ("Date", "date"),
+)
+
+_CERT_ADDITIONAL_FIELDS = (
+    ("Device Path", "device_path"),
+    ("Device Size", "device_size"),
+    ("Verification Status", "verification_status"),
+    ("Completion Time", "completion_time"),
+    ("Certificate ID", "certificate_id"),
+)
+
+# Fixed budget for the verification-details block so the sections below
+# it sit at template-stable coordinates
+_CERT_DETAIL_LINES = 12
+
+
+# The compliance statement is constant, so wrap it once at import with
+# textwrap (C-accelerated, handles the edge cases the old hand-rolled
+# word loop quadratically rebuilt strings for)
+_COMPLIANCE_TEXT = (
+    "This sanitization was performed in accordance with NIST Special Publication 800-88r2, "
+    "Guidelines for Media Sanitization. The sanitization method and technique were selected "
+    "based on the official NIST decision flowchart, taking into account data sensitivity level, "
+    "device reuse plans, and physical control requirements."
+)
+_COMPLIANCE_LINES = tuple(textwrap.wrap(_COMPLIANCE_TEXT, width=80))
+
+
+@lru_cache(maxsize=1)
+def _cert_layout() -> dict:
+    """Compute the y coordinate of every certificate element once.
+
+    Static template and per-wipe overlay draw onto separate pages, so
+    they must agree on positions; deriving both from one layout table
+    keeps them aligned.
     """
-    try:
-        from reportlab.lib.pagesizes import A4  # type: ignore
-        from reportlab.pdfgen import canvas  # type: ignore
-        from reportlab.lib.units import mm  # type: ignore
-        from reportlab.lib import colors  # type: ignore
-    except Exception:
-        console.print("[red]reportlab not installed. Cannot create PDF certificate.[/red]")
-        return ""
+    rl = _rl()
+    mm = rl.mm
 
-    out_dir = ensure_out_dir()
-    pdf_path = os.path.join(out_dir, "nist_certificate.pdf")
+    _, height = rl.A4
+    pos: dict = {"rows": {}}
+    y = height - 20 * mm
+    pos["title"] = y
+    y -= 10 * mm
+    pos["badge"] = y
+    y -= 15 * mm
+    pos["required_heading"] = y
+    y -= 8 * mm
+    for _label, key in _CERT_REQUIRED_FIELDS:
+        pos["rows"][key] = y
+        y -= 6 * mm
+    y -= 10 * mm
+    pos["additional_heading"] = y
+    y -= 8 * mm
+    for _label, key in _CERT_ADDITIONAL_FIELDS:
+        pos["rows"][key] = y
+        y -= 6 * mm
+    y -= 10 * mm
+    pos["details_heading"] = y
+    y -= 8 * mm
+    pos["details_top"] = y
+    y -= _CERT_DETAIL_LINES * 5 * mm + 10 * mm
+    pos["compliance_heading"] = y
+    y -= 8 * mm
+    pos["compliance_top"] = y
+    y -= len(_COMPLIANCE_LINES) * 6 * mm + 10 * mm
+    pos["signature_heading"] = y
+    y -= 8 * mm
+    pos["signature_text"] = y
+    pos["certificate_id_line"] = y - 12 * mm
+    pos["footer"] = 30 * mm
+    return pos
 
-    c = canvas.Canvas(pdf_path, pagesize=A4)
-    width, height = A4
+
+def _draw_cert_static(c) -> None:
+    """Draw everything that is identical across certificates."""
+    rl = _rl()
+    mm, colors = rl.mm, rl.colors
+
+    pos = _cert_layout()
 
     # Header
-    y = height - 20 * mm
     c.setFont("Helvetica-Bold", 16)
     c.setFillColor(colors.darkblue)
-    c.drawString(20 * mm, y, "Shoonya Wipe - NIST SP 800-88r2 Compliance Certificate")
-    y -= 10 * mm
+    c.drawString(20 * mm, pos["title"], "Shoonya Wipe - NIST SP 800-88r2 Compliance Certificate")
 
     # NIST Compliance Badge
     c.setFont("Helvetica-Bold", 12)
     c.setFillColor(colors.green)
-    c.drawString(20 * mm, y, "✓ NIST SP 800-88r2 Compliant")
-    y -= 15 * mm
+    c.drawString(20 * mm, pos["badge"], "✓ NIST SP 800-88r2 Compliant")
 
     # Required NIST Fields (Section 4.6)
     c.setFont("Helvetica-Bold", 14)
     c.setFillColor(colors.black)
-    c.drawString(20 * mm, y, "Required Sanitization Information")
-    y -= 8 * mm
+    c.drawString(20 * mm, pos["required_heading"], "Required Sanitization Information")
+    c.drawString(20 * mm, pos["additional_heading"], "Additional Information")
+
+    c.setFont("Helvetica-Bold", 10)
+    for label, key in _CERT_REQUIRED_FIELDS + _CERT_ADDITIONAL_FIELDS:
+        c.drawString(20 * mm, pos["rows"][key], f"{label}:")
+
+    # One font run per style group: both Bold-12 headings together, then
+    # all Helvetica-10 body text, so the page carries one setFont
+    # operator per style instead of one per section
+    c.setFont("Helvetica-Bold", 12)
+    c.setFillColor(colors.darkblue)
+    c.drawString(20 * mm, pos["compliance_heading"], "Compliance Statement")
+    c.setFillColor(colors.black)
+    c.drawString(20 * mm, pos["signature_heading"], "Digital Signature")
 
     c.setFont("Helvetica", 10)
-    def line(label: str, value: str):
-        nonlocal y
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(20 * mm, y, f"{label}:")
-        c.setFont("Helvetica", 10)
-        c.drawString(80 * mm, y, str(value))
+    y = pos["compliance_top"]
+    for line_text in _COMPLIANCE_LINES:
+        c.drawString(20 * mm, y, line_text)
         y -= 6 * mm
+    c.drawString(20 * mm, pos["signature_text"], "This certificate is digitally signed and can be verified using the")
+    c.drawString(20 * mm, pos["signature_text"] - 6 * mm, "corresponding public key and signed log files.")
 
-    # All required NIST fields
-    line("Manufacturer", certificate.get("manufacturer", "N/A"))
-    line("Model", certificate.get("model", "N/A"))
-    line("Serial Number", certificate.get("serial_number", "N/A"))
-    line("Media Type", certificate.get("media_type", "N/A"))
-    line("Sanitization Method", certificate.get("sanitization_method", "N/A"))
-    line("Sanitization Technique", certificate.get("sanitization_technique", "N/A"))
-    line("Tool Used", certificate.get("tool_used", "N/A"))
-    line("Verification Method", certificate.get("verification_method", "N/A"))
-    line("Operator Name", certificate.get("operator_name", "N/A"))
-    line("Operator Title", certificate.get("operator_title", "N/A"))
-    line("Date", certificate.get("date", "N/A"))
+    # Footer
+    c.setFont("Helvetica", 8)
+    c.setFillColor(colors.grey)
+    c.drawString(20 * mm, pos["footer"], "Generated by Shoonya Wipe - NIST SP 800-88r2 Compliant")
 
-    y -= 10 * mm
 
-    # Additional Information
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(20 * mm, y, "Additional Information")
-    y -= 8 * mm
+def _draw_cert_values(c, certificate: dict) -> None:
+    """Draw only the per-wipe values, positioned against the template."""
+    rl = _rl()
+    mm, colors = rl.mm, rl.colors
+
+    pos = _cert_layout()
 
     c.setFont("Helvetica", 10)
-    line("Device Path", certificate.get("device_path", "N/A"))
-    line("Device Size", certificate.get("device_size", "N/A"))
-    line("Verification Status", certificate.get("verification_status", "N/A"))
-    line("Completion Time", certificate.get("completion_time", "N/A"))
-    line("Certificate ID", certificate.get("certificate_id", "N/A"))
+    c.setFillColor(colors.black)
+    for _label, key in _CERT_REQUIRED_FIELDS + _CERT_ADDITIONAL_FIELDS:
+        c.drawString(80 * mm, pos["rows"][key], str(certificate.get(key, "N/A")))
 
     # Verification Details Section
     verification_details = certificate.get("verification_details", [])
     if verification_details:
-        y -= 10 * mm
         c.setFont("Helvetica-Bold", 12)
-        c.drawString(20 * mm, y, "Verification Details")
-        y -= 8 * mm
-        
+        c.drawString(20 * mm, pos["details_heading"], "Verification Details")
         c.setFont("Helvetica", 9)
-        for detail in verification_details:
+        y = pos["details_top"]
+        # Bounded block: the sections below sit at fixed coordinates
+        for detail in verification_details[:_CERT_DETAIL_LINES]:
             c.drawString(20 * mm, y, f"• {detail}")
             y -= 5 * mm
-            if y < 50 * mm:  # Prevent text from going off page
-                break
 
-    y -= 15 * mm
+    c.setFont("Helvetica", 10)
+    c.drawString(20 * mm, pos["certificate_id_line"], f"Certificate ID: {certificate.get('certificate_id', 'N/A')}")
 
-    # Compliance Statement
-    c.setFont("Helvetica-Bold", 12)
-    c.setFillColor(colors.darkblue)
-    c.drawString(20 * mm, y, "Compliance Statement")
-    y -= 8 * mm
+    c.setFont("Helvetica", 8)
+    c.setFillColor(colors.grey)
+    c.drawString(20 * mm, pos["footer"] - 6, f"Generated on: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
 
-    c.setFont("Helvetica", 10)
-    c.setFillColor(colors.black)
-    compliance_text = (
-        "This sanitization was performed in accordance with NIST Special Publication 800-88r2, "
-        "Guidelines for Media Sanitization. The sanitization method and technique were selected "
-        "based on the official NIST decision flowchart, taking into account data sensitivity level, "
-        "device reuse plans, and physical control requirements."
-    )
-    
-    # Wrap text
-    lines = []
-    words = compliance_text.split()
-    current_line = ""
-    for word in words:
-        if len(current_line + " " + word) < 80:  # Approximate character limit
-            current_line += " " + word if current_line else word
-        else:
-            lines.append(current_line)
-            current_line = word
-    if current_line:
-        lines.append(current_line)
-    
-    for line_text in lines:
-        c.drawString(20 * mm, y, line_text)
-        y -= 6 * mm
 
-    y -= 10 * mm
+@lru_cache(maxsize=1)
+def _nist_cert_template() -> bytes | None:
+    """Render the static certificate page once per process.
 
-    # Signature Section
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(20 * mm, y, "Digital Signature")
-    y -= 8 * mm
+    Headers, field labels, the word-wrapped compliance paragraph and the
+    footer never change between wipes; batch runs and the web GUI stamp
+    values over this cached page instead of re-laying it out each time.
+    """
+    try:
+        rl = _rl()
+    except Exception:
+        return None
+    buf = io.BytesIO()
+    c = rl.canvas.Canvas(buf, pagesize=rl.A4)
+    _draw_cert_static(c)
+    c.showPage()
+    c.save()
+    return buf.getvalue()
 
-    c.setFont("Helvetica", 10)
-    c.drawString(20 * mm, y, "This certificate is digitally signed and can be verified using the")
-    y -= 6 * mm
-    c.drawString(20 * mm, y, "corresponding public key and signed log files.")
-    y -= 6 * mm
-    c.drawString(20 * mm, y, f"Certificate ID: {certificate.get('certificate_id', 'N/A')}")
 
-    # Footer
-    y = 30 * mm
-    c.setFont("Helvetica", 8)
-    c.setFillColor(colors.grey)
-    c.drawString(20 * mm, y, "Generated by Shoonya Wipe - NIST SP 800-88r2 Compliant")
-    c.drawString(20 * mm, y - 6, f"Generated on: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+def render_nist_pdf_certificate(certificate: dict) -> str:
+    """
+    Rule 4.1: Include All Required Fields in Certificates (Page 30)
+    Generate NIST-compliant PDF certificate with all required fields.
+    """
+    template = _nist_cert_template()
+    if template is None:
+        _console().print("[red]reportlab not installed. Cannot create PDF certificate.[/red]")
+        return ""
+
+    rl = _rl()
+
+    out_dir = ensure_out_dir()
+    pdf_path = os.path.join(out_dir, "nist_certificate.pdf")
+    # Draw-then-rename gives every certificate a fresh inode, so
+    # exported hardlinks of earlier runs are never truncated underneath
+    tmp_path = pdf_path + ".tmp"
 
+    try:
+        from PyPDF2 import PdfReader, PdfWriter  # type: ignore
+    except Exception:
+        # No merger available: draw static + values onto one canvas
+        c = rl.canvas.Canvas(tmp_path, pagesize=rl.A4)
+        _draw_cert_static(c)
+        _draw_cert_values(c, certificate)
+        c.showPage()
+        c.save()
+        os.replace(tmp_path, pdf_path)
+        return pdf_path
+
+    overlay_buf = io.BytesIO()
+    c = rl.canvas.Canvas(overlay_buf, pagesize=rl.A4)
+    _draw_cert_values(c, certificate)
     c.showPage()
     c.save()
+
+    page = PdfReader(io.BytesIO(template)).pages[0]
+    page.merge_page(PdfReader(overlay_buf).pages[0])
+    writer = PdfWriter()
+    writer.add_page(page)
+    with open(tmp_path, "wb") as f:
+        writer.write(f)
+    os.replace(tmp_path, pdf_path)
     return pdf_path
 
 
 def main() -> int:
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+
+    console = _console()
     console.print(Panel.fit(
         "🔒 Shoonya Wipe - NIST SP 800-88r2 Compliant CLI\n"
         "Secure Data Wiping Tool with AI-Guided Decision Process",
@@ -612,13 +1024,14 @@ def main() -> int:
             "compliance_checked": True
         },
         "certificate": certificate,
-        "timestamp_end": datetime.utcnow().isoformat() + "Z"
+        "timestamp_end": _utcnow_iso()
     })
 
-    # Write logs and certificates
-    log_path = write_log(log)
-    signed = sign_json(log)
-    signed_path = write_log(signed, filename="wipelog_signed.json")
+    # Write logs and certificates; the canonical bytes feed both the
+    # unsigned log on disk and the signature hash
+    canon = serialize_log(log)
+    log_path = write_bytes(canon)
+    signed_path = write_bytes(sign_bytes(canon, log), filename="wipelog_signed.json")
     
     # Generate NIST-compliant PDF certificate
     pdf_path = render_nist_pdf_certificate(certificate)
@@ -635,12 +1048,7 @@ def main() -> int:
     )
     exported_paths: list[str] = []
     if export_dir:
-        os.makedirs(export_dir, exist_ok=True)
-        for p in [log_path, signed_path, pdf_path]:
-            if p and os.path.exists(p):
-                dst = os.path.join(export_dir, os.path.basename(p))
-                shutil.copy2(p, dst)
-                exported_paths.append(dst)
+        exported_paths = export_artifacts([log_path, signed_path, pdf_path], export_dir)
 
     # Display final results
     console.print("\n" + "="*60)
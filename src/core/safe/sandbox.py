@@ -3,12 +3,119 @@
 Sandbox virtual media provider: file-backed disks for safe wiping in Docker.
 """
 
+import ctypes
+import mmap
 import os
+import struct
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any
 
 DEFAULT_DIR = Path(os.environ.get("SAFEERASE_SANDBOX_DIR", "/app/virtual_media"))
 
+# fallocate(2) mode flags (linux/falloc.h)
+_FALLOC_FL_KEEP_SIZE = 0x01
+_FALLOC_FL_PUNCH_HOLE = 0x02
+
+# FITRIM ioctl (linux/fs.h); payload is struct fstrim_range {start, len, minlen}
+_FITRIM = 0xC0185879
+
+# Map-and-fill window for single-byte patterns; 1 GiB keeps address-space
+# use bounded on 32-bit builds and is granularity-aligned for mmap offsets
+_MAP_WINDOW = 1 << 30
+
+
+def _fadvise(fd: int, size: int, advice_name: str) -> None:
+    """Advise the kernel about our access pattern; no-op where unsupported.
+
+    SEQUENTIAL doubles readahead for the pass; DONTNEED drops our pages
+    after the flush so a wipe doesn't evict co-running tests' cache on
+    small-memory CI runners.
+    """
+    try:
+        os.posix_fadvise(fd, 0, size, getattr(os, advice_name))
+    except (AttributeError, OSError):
+        pass
+
+
+def _memset_file(fd: int, size: int, value: int) -> None:
+    """Fill an open file with one byte value via mmap windows.
+
+    ctypes.memset resolves to glibc's vectorized memset, collapsing the
+    Python write loop into wide stores against the mapping; the kernel
+    batches writeback when each window is flushed.
+    """
+    off = 0
+    while off < size:
+        n = min(_MAP_WINDOW, size - off)
+        mm = mmap.mmap(fd, n, offset=off)
+        try:
+            buf = (ctypes.c_char * n).from_buffer(mm)
+            ctypes.memset(buf, value, n)
+            # Release the buffer export before close or mmap refuses it
+            del buf
+            mm.flush()
+        finally:
+            mm.close()
+        off += n
+
+
+def _fitrim(mount_dir: Path) -> bool:
+    """Ask the filesystem to TRIM free space under mount_dir.
+
+    Pre-erased flash blocks make subsequent wipe runs faster and match
+    the Sanitize-after-TRIM semantics the crypto-erase simulation models.
+    Returns False when the filesystem or device does not support it.
+    """
+    # Local import: fcntl does not exist on Windows, and a top-level
+    # import would make the whole module (and its importers) unloadable
+    # there
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        dirfd = os.open(mount_dir, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return False
+    try:
+        fcntl.ioctl(dirfd, _FITRIM, struct.pack("QQQ", 0, (1 << 64) - 1, 0))
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(dirfd)
+
+
+def _punch_hole(fd: int, size: int) -> bool:
+    """Return the file's data blocks to the filesystem in O(1).
+
+    Punched ranges read back as zeros, so for a zero wipe of a sparse
+    sandbox image this is equivalent to the write loop without touching
+    a byte. Returns False when libc or the filesystem lacks support.
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.fallocate.argtypes = [ctypes.c_int, ctypes.c_int,
+                                   ctypes.c_longlong, ctypes.c_longlong]
+        ret = libc.fallocate(fd, _FALLOC_FL_PUNCH_HOLE | _FALLOC_FL_KEEP_SIZE, 0, size)
+        return ret == 0
+    except (OSError, AttributeError):
+        return False
+
+
+def reset_sandbox_disk(path: Path) -> bool:
+    """Hot-reset a sandbox disk between test runs.
+
+    truncate alone leaves extents dirtied by earlier wipes allocated;
+    punching the whole file releases them while keeping the logical size.
+    """
+    with open(path, "r+b") as f:
+        size = os.fstat(f.fileno()).st_size
+        punched = _punch_hole(f.fileno(), size)
+        os.ftruncate(f.fileno(), size)
+        return punched
+
 
 def ensure_sandbox_disks(count: int = 2, size_gib: int = 2) -> List[Path]:
     DEFAULT_DIR.mkdir(parents=True, exist_ok=True)
@@ -22,14 +129,17 @@ def ensure_sandbox_disks(count: int = 2, size_gib: int = 2) -> List[Path]:
     return disks
 
 
+@lru_cache(maxsize=1)
 def list_sandbox_devices() -> List[Dict[str, Any]]:
+    # The sandbox disk set is static for the life of the process; callers that
+    # recreate disks can list_sandbox_devices.cache_clear() to re-enumerate.
     count = int(os.environ.get("SANDBOX_VDISKS", "2"))
     size_gib = int(os.environ.get("SANDBOX_VDISK_SIZE_GIB", "2"))
     disks = ensure_sandbox_disks(count, size_gib)
     devices: List[Dict[str, Any]] = []
     for p in disks:
-        size_bytes = p.stat().st_size
-        size_str = f"{size_bytes // (1024**3)}G"
+        st = p.stat()
+        size_str = f"{st.st_size // (1024**3)}G"
         devices.append(
             {
                 "name": p.stem.upper(),
@@ -45,30 +155,84 @@ def list_sandbox_devices() -> List[Dict[str, Any]]:
     return devices
 
 
-def overwrite_file(path: Path, pattern: bytes = b"\x00", chunk_size: int = 1024 * 1024) -> Dict[str, Any]:
+def overwrite_file(path: Path, pattern: bytes = b"\x00", chunk_size: int = 16 * 1024 * 1024) -> Dict[str, Any]:
     """Overwrite file with pattern and return verification details."""
     verification_details = []
-    
+
     try:
         with open(path, "r+b") as f:
-            size = path.stat().st_size
+            # fstat on the open fd: no second path resolution
+            size = os.fstat(f.fileno()).st_size
+            _fadvise(f.fileno(), size, "POSIX_FADV_SEQUENTIAL")
+
+            # Zero wipes on hole-punch-capable filesystems: deallocating
+            # the extents yields an all-zero file without writing anything
+            if pattern == b"\x00" and _punch_hole(f.fileno(), size):
+                os.fsync(f.fileno())
+                # No bytes are written on this path — the details feed
+                # the certificate evidence trail and must say what
+                # actually happened
+                verification_details.append(f"Starting zero wipe of {size} bytes")
+                verification_details.append(f"Pattern: {pattern.hex()}")
+                verification_details.append("Extents deallocated via hole punch; file reads back as zeros")
+                verification_details.append(f"Total bytes deallocated: {size}")
+                verification_details.append("File system sync completed")
+                return {
+                    "success": True,
+                    "verification_details": verification_details,
+                    "bytes_written": 0
+                }
+
+            # Single-byte patterns: map the file and let glibc's memset do
+            # wide vectorized stores instead of a Python write loop
+            if len(pattern) == 1 and size > 0:
+                _memset_file(f.fileno(), size, pattern[0])
+                os.fsync(f.fileno())
+                _fadvise(f.fileno(), size, "POSIX_FADV_DONTNEED")
+                verification_details.append(f"Starting overwrite of {size} bytes")
+                verification_details.append(f"Pattern: {pattern.hex()}")
+                verification_details.append("Filled via memory-mapped memset")
+                verification_details.append("Overwrite completed successfully")
+                verification_details.append(f"Total bytes written: {size}")
+                verification_details.append("File system sync completed")
+                return {
+                    "success": True,
+                    "verification_details": verification_details,
+                    "bytes_written": size
+                }
+
             written = 0
-            buf = pattern * (chunk_size // len(pattern))
-            
+            # One full-size buffer, viewed not copied: mv[:n] slices the
+            # memoryview without duplicating the 16 MiB pattern each loop
+            mv = memoryview(pattern * (chunk_size // len(pattern)))
+            fd = f.fileno()
+            # Vectored writes submit up to 8 chunks (128 MiB) per syscall,
+            # cutting user-kernel transitions 8x on full-speed stretches
+            iov = [mv] * 8
+            use_pwritev = hasattr(os, "pwritev")
+
             verification_details.append(f"Starting overwrite of {size} bytes")
             verification_details.append(f"Pattern: {pattern.hex()}")
-            
+
+            # Progress every 10% by threshold, not modulo: the modulo check
+            # silently skipped updates whenever a chunk straddled a boundary
+            step = max(1, size // 10)
+            next_progress = step
             while written < size:
-                to_write = min(chunk_size, size - written)
-                f.write(buf[:to_write])
-                written += to_write
-                
-                # Progress update every 10%
-                if written % (size // 10) == 0:
+                remaining = size - written
+                k = remaining // chunk_size
+                if use_pwritev and k >= 2:
+                    written += os.pwritev(fd, iov[:min(8, k)], written)
+                else:
+                    n = min(chunk_size, remaining)
+                    written += os.pwrite(fd, mv[:n] if n != chunk_size else mv, written)
+
+                if written >= next_progress:
                     verification_details.append(f"Progress: {written // (1024*1024)}MB / {size // (1024*1024)}MB")
-            
-            f.flush()
-            os.fsync(f.fileno())
+                    next_progress += step
+
+            os.fsync(fd)
+            _fadvise(fd, size, "POSIX_FADV_DONTNEED")
             
             verification_details.append("Overwrite completed successfully")
             verification_details.append(f"Total bytes written: {written}")
@@ -88,37 +252,71 @@ def overwrite_file(path: Path, pattern: bytes = b"\x00", chunk_size: int = 1024
         }
 
 
+def overwrite_files(paths: List[Path], pattern: bytes = b"\x00",
+                    chunk_size: int = 16 * 1024 * 1024) -> Dict[str, Dict[str, Any]]:
+    """Overwrite several files, in parallel when SHOONYA_PARALLEL_WIPE=1.
+
+    Sandbox disks are independent files; the writes are I/O-bound so
+    threads overlap them without GIL contention. Serial by default to
+    avoid thrashing a single backing device.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    if os.environ.get("SHOONYA_PARALLEL_WIPE") == "1" and len(paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+            futures = {
+                pool.submit(overwrite_file, p, pattern, chunk_size): p
+                for p in paths
+            }
+            for fut in as_completed(futures):
+                results[futures[fut].as_posix()] = fut.result()
+    else:
+        for p in paths:
+            results[p.as_posix()] = overwrite_file(p, pattern, chunk_size)
+    return results
+
+
 def cryptographic_erase_file(path: Path) -> Dict[str, Any]:
     """Simulate cryptographic erase and return verification details."""
     verification_details = []
     
     try:
-        import os as _os
         chunk = 16 * 1024 * 1024
-        size = path.stat().st_size
-        
-        verification_details.append(f"Starting cryptographic erase simulation on {size} bytes")
-        verification_details.append("Simulating encryption key destruction")
-        
+
+        # AES-CTR keystream from a throwaway key: AES-NI generates random
+        # bytes an order of magnitude faster than 16 MiB os.urandom reads,
+        # and only the 32-byte key needs kernel entropy
+        from Crypto.Cipher import AES
+        cipher = AES.new(os.urandom(32), AES.MODE_CTR, nonce=os.urandom(8))
+        zeros = bytes(chunk)
+
         with open(path, "r+b") as f:
+            size = os.fstat(f.fileno()).st_size
+
+            verification_details.append(f"Starting cryptographic erase simulation on {size} bytes")
+            verification_details.append("Simulating encryption key destruction")
+
             # Overwrite first 16 MiB with random data
             f.seek(0)
             first_chunk_size = min(chunk, size)
-            random_data = _os.urandom(first_chunk_size)
-            f.write(random_data)
+            f.write(cipher.encrypt(zeros[:first_chunk_size]))
             verification_details.append(f"Overwrote first {first_chunk_size} bytes with random data")
-            
+
             # Overwrite last 16 MiB with random data
             if size > chunk:
                 f.seek(max(0, size - chunk))
                 last_chunk_size = min(chunk, size - chunk)
-                random_data = _os.urandom(last_chunk_size)
-                f.write(random_data)
+                f.write(cipher.encrypt(zeros[:last_chunk_size]))
                 verification_details.append(f"Overwrote last {last_chunk_size} bytes with random data")
             
             f.flush()
             os.fsync(f.fileno())
-            
+
+            # The rewrite only touched the endpoints; trimming the mount
+            # releases the rest of the file's blocks on the backing SSD
+            if _fitrim(path.parent):
+                verification_details.append("FITRIM issued on mount")
+
             verification_details.append("Cryptographic erase simulation completed")
             verification_details.append("Encryption key destruction simulated")
             verification_details.append("File system sync completed")
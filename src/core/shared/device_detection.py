@@ -5,31 +5,60 @@ Cross-platform device detection for both safe and production modes.
 """
 
 import os
-import subprocess
 import platform
+import time
 from typing import List, Dict, Optional
 from .nist_types import DeviceInfo
 
+# The platform never changes at runtime; resolve it once instead of per
+# detector (certificate building instantiates one per invocation)
+_SYSTEM = platform.system().lower()
+
+# Detection spawns lsblk/PowerShell; a short TTL makes repeated detector
+# calls within one flow free while still noticing hotplug quickly
+_CACHE_TTL = 5.0
+_DETECT_CACHE = {"ts": 0.0, "data": None}
+
+
+def invalidate_detection_cache() -> None:
+    """Force the next detect_devices() call to re-enumerate."""
+    _DETECT_CACHE["ts"] = 0.0
+    _DETECT_CACHE["data"] = None
+
+
 class DeviceDetector:
     """Cross-platform device detection."""
-    
+
     def __init__(self):
-        self.system = platform.system().lower()
-    
+        self.system = _SYSTEM
+
     def detect_devices(self) -> List[DeviceInfo]:
         """Detect available storage devices."""
+        if (
+            _DETECT_CACHE["data"] is not None
+            and time.monotonic() - _DETECT_CACHE["ts"] < _CACHE_TTL
+        ):
+            return _DETECT_CACHE["data"]
+
         if self.system == "linux":
-            return self._detect_linux_devices()
+            devices = self._detect_linux_devices()
         elif self.system == "windows":
-            return self._detect_windows_devices()
+            devices = self._detect_windows_devices()
         else:
-            return self._detect_virtual_devices()
+            devices = self._detect_virtual_devices()
+
+        _DETECT_CACHE["ts"] = time.monotonic()
+        _DETECT_CACHE["data"] = devices
+        return devices
     
     def _detect_linux_devices(self) -> List[DeviceInfo]:
         """Detect devices on Linux systems."""
         devices = []
-        
+
         try:
+            # Deferred: only the Linux path ever spawns a process
+            import subprocess
+
             # Use lsblk to get device information
             result = subprocess.run(
                 ['lsblk', '-J'], 
@@ -62,9 +91,19 @@ class DeviceDetector:
         return devices
     
     def _detect_windows_devices(self) -> List[DeviceInfo]:
-        """Detect devices on Windows systems."""
+        """Detect devices on Windows systems.
+
+        Prefers an in-process WMI query (the wmi package) — spawning
+        powershell.exe costs several hundred ms of CLR startup per
+        detection. Falls back to the PowerShell path when wmi is not
+        installed.
+        """
+        wmi_devices = self._detect_windows_wmi()
+        if wmi_devices is not None:
+            return wmi_devices
+
         devices = []
-        
+
         try:
             # Use PowerShell to get disk information
             ps_command = """
@@ -72,7 +111,9 @@ class DeviceDetector:
             Select-Object DeviceID, Model, SerialNumber, Size, InterfaceType |
             ConvertTo-Json
             """
-            
+
+            import subprocess
+
             result = subprocess.run(
                 ['powershell', '-Command', ps_command],
                 capture_output=True, text=True, check=True
@@ -100,9 +141,40 @@ class DeviceDetector:
             print(f"Error detecting Windows devices: {e}")
             # Fallback to virtual devices for safety
             return self._detect_virtual_devices()
-        
+
         return devices
-    
+
+    def _detect_windows_wmi(self) -> Optional[List[DeviceInfo]]:
+        """Query Win32_DiskDrive in-process; None when wmi is unavailable."""
+        try:
+            import wmi  # type: ignore
+        except ImportError:
+            return None
+
+        devices = []
+        try:
+            for disk in wmi.WMI().Win32_DiskDrive():
+                device_id = disk.DeviceID or ''
+                devices.append(DeviceInfo(
+                    name=device_id.replace('\\\\.\\', ''),
+                    path=device_id,
+                    model=disk.Model or '',
+                    serial=disk.SerialNumber or '',
+                    size=str(disk.Size or 0),
+                    transport=disk.InterfaceType or '',
+                    media_type=self._get_media_type({
+                        'model': disk.Model or '',
+                        'tran': disk.InterfaceType or '',
+                    }),
+                    is_encrypted=False,
+                    encryption_always_on=False
+                ))
+        except Exception as e:
+            print(f"Error detecting Windows devices via WMI: {e}")
+            return None
+
+        return devices
+
     def _detect_virtual_devices(self) -> List[DeviceInfo]:
         """Detect virtual devices for safe testing."""
         devices = []
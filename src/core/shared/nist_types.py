@@ -23,9 +23,13 @@ class SanitizationTechnique(Enum):
     CRYPTOGRAPHIC_ERASE = "Cryptographic Erase"
     PHYSICAL_DESTRUCTION = "Physical Destruction"
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
-    """Device information structure."""
+    """Device information structure.
+
+    Slotted: detectors build one per disk and the fixed layout drops the
+    per-instance __dict__ and speeds attribute access in device loops.
+    """
     name: str
     path: str
     model: Optional[str] = None
@@ -36,9 +40,13 @@ class DeviceInfo:
     is_encrypted: bool = False
     encryption_always_on: bool = False
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SanitizationResult:
-    """Result of sanitization operation."""
+    """Result of sanitization operation.
+
+    Frozen: results are records of what happened; nothing should edit
+    one after the engine returns it.
+    """
     success: bool
     method: SanitizationMethod
     technique: SanitizationTechnique
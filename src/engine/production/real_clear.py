@@ -17,18 +17,35 @@ class RealClearEngine:
         self.logger = logging.getLogger(__name__)
         self.wiper = RealDeviceWiper()
     
-    def execute_clear(self, device: DeviceInfo, progress_callback: Optional[Callable[[int, int], None]] = None) -> SanitizationResult:
-        """Execute NIST Clear method on real device."""
+    def execute_clear(self, device: DeviceInfo, progress_callback: Optional[Callable[[int, int], None]] = None,
+                      io_mode: str = "auto") -> SanitizationResult:
+        """Execute NIST Clear method on real device.
+
+        io_mode is forwarded to RealDeviceWiper.execute_clear: "auto"
+        prefers the in-process O_DIRECT writer, which batches large
+        aligned writes straight to the device and keeps the single-pass
+        overwrite device-bound instead of syscall-bound; "cached" forces
+        the legacy dd path. On the direct path verification is fused
+        into the overwrite (read-back of each chunk overlaps the next
+        write), so Clear+Verify costs one device traversal, not two.
+        """
         try:
             self.logger.info(f"Starting Clear method on {device.path}")
-            
+
             # Execute real device wipe
-            success, message = self.wiper.execute_clear(device.path, progress_callback)
-            
+            if io_mode == "cached":
+                success, message = self.wiper.execute_clear(device.path, progress_callback, io_mode=io_mode)
+                verified_inline = False
+            else:
+                success, verified_inline, message = self.wiper.execute_clear_verified(device.path, progress_callback)
+
             if success:
-                # Verify the wipe
-                verify_success, verify_message = self.wiper.verify_wipe(device.path)
-                
+                # Verify the wipe (already done inline on the direct path)
+                if verified_inline:
+                    verify_success, verify_message = True, message
+                else:
+                    verify_success, verify_message = self.wiper.verify_wipe(device.path)
+
                 result = SanitizationResult(
                     success=success,
                     method=SanitizationMethod.CLEAR,
@@ -5,13 +5,25 @@ Production mode dispatcher for real device operations.
 """
 
 import logging
-from typing import Optional, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Callable
 from core.shared.nist_types import DeviceInfo, SanitizationMethod
 from core.production.production_mode import production_manager
 from core.production.safety_controls import SafetyController
 from .real_clear import RealClearEngine
 from .real_purge import RealPurgeEngine
 
+# media_type -> preferred method, resolved once; flash prefers Purge,
+# magnetic gets a Clear overwrite
+_METHOD_TABLE = {
+    "flash": SanitizationMethod.PURGE,
+    "flash memory": SanitizationMethod.PURGE,
+    "nvme": SanitizationMethod.PURGE,
+}
+
+# Model-name hints for SSDs mislabeled as magnetic/unknown media
+_SSD_MODEL_HINTS = ("ssd", "nvme", "solid state")
+
 class RealDispatcher:
     """Dispatches real device operations based on NIST methods."""
     
@@ -44,8 +56,18 @@ class RealDispatcher:
             if not self.safety_controller.require_confirmation(device.path, method.value):
                 self.logger.warning("User cancelled operation")
                 return False
-            
-            # Execute the appropriate method
+
+            return self._execute_confirmed(device, method, progress_callback)
+
+        except Exception as e:
+            self.logger.error(f"Unexpected error in wipe execution: {e}")
+            self.safety_controller.log_safety_event("WIPE_ERROR", device.path)
+            return False
+
+    def _execute_confirmed(self, device: DeviceInfo, method: SanitizationMethod,
+                           progress_callback: Optional[Callable[[int, int], None]] = None) -> bool:
+        """Dispatch an already-validated, already-confirmed wipe."""
+        try:
             if method == SanitizationMethod.CLEAR:
                 result = self.clear_engine.execute_clear(device, progress_callback)
             elif method == SanitizationMethod.PURGE:
@@ -53,7 +75,7 @@ class RealDispatcher:
             else:
                 self.logger.error(f"Unsupported method: {method}")
                 return False
-            
+
             # Log the result
             if result.success:
                 self.logger.info(f"Wipe operation completed successfully: {method.value}")
@@ -61,14 +83,63 @@ class RealDispatcher:
             else:
                 self.logger.error(f"Wipe operation failed: {result.error_message}")
                 self.safety_controller.log_safety_event("WIPE_FAILED", device.path)
-            
+
             return result.success
-            
+
         except Exception as e:
             self.logger.error(f"Unexpected error in wipe execution: {e}")
             self.safety_controller.log_safety_event("WIPE_ERROR", device.path)
             return False
-    
+
+    def execute_wipes(self, devices: List[DeviceInfo], method: SanitizationMethod) -> Dict[str, bool]:
+        """Wipe several devices concurrently; returns {path: success}.
+
+        Each worker touches only its own device path — the wipes share
+        no state beyond the serialized safety log — so wall-clock time
+        is bounded by the slowest device instead of the sum. Validation
+        runs up front and one batch confirmation covers every device;
+        anything that fails validation is reported False without
+        blocking the rest.
+        """
+        results: Dict[str, bool] = {}
+
+        env_valid, env_errors = self.safety_controller.validate_production_environment()
+        if not env_valid:
+            self.logger.error("Production environment validation failed:")
+            for error in env_errors:
+                self.logger.error(f"  - {error}")
+            return {d.path: False for d in devices}
+
+        eligible: List[DeviceInfo] = []
+        for device in devices:
+            device_valid, device_errors = self.safety_controller.validate_device_safety(device.path)
+            if device_valid:
+                eligible.append(device)
+            else:
+                self.logger.error(f"Device safety validation failed for {device.path}:")
+                for error in device_errors:
+                    self.logger.error(f"  - {error}")
+                results[device.path] = False
+
+        if not eligible:
+            return results
+
+        if not self.safety_controller.require_confirmation_batch(
+            [d.path for d in eligible], method.value
+        ):
+            self.logger.warning("User cancelled batch operation")
+            results.update({d.path: False for d in eligible})
+            return results
+
+        with ThreadPoolExecutor(max_workers=len(eligible)) as pool:
+            futures = {
+                pool.submit(self._execute_confirmed, device, method): device
+                for device in eligible
+            }
+            for future in as_completed(futures):
+                results[futures[future].path] = future.result()
+        return results
+
     def run_one_click_wipe(self, device: DeviceInfo, progress_callback: Optional[Callable[[int, int], None]] = None) -> bool:
         """Run one-click wipe with automatic method selection."""
         try:
@@ -87,8 +158,11 @@ class RealDispatcher:
     def _determine_best_method(self, device: DeviceInfo) -> SanitizationMethod:
         """Determine the best NIST method for the device."""
         # For production, prefer Purge for SSDs, Clear for HDDs
-        if device.media_type == "Flash" or "ssd" in device.model.lower():
+        method = _METHOD_TABLE.get((device.media_type or "").lower())
+        if method is not None:
+            return method
+        model_lower = (device.model or "").lower()
+        if any(hint in model_lower for hint in _SSD_MODEL_HINTS):
             return SanitizationMethod.PURGE
-        else:
-            return SanitizationMethod.CLEAR
+        return SanitizationMethod.CLEAR
 